@@ -3,6 +3,7 @@ from models import db
 from flask_migrate import Migrate
 from flask_cors import CORS
 from routes import register_blueprints
+from commands import register_commands
 from flask_jwt_extended import JWTManager
 import os
 
@@ -23,6 +24,7 @@ jwt = JWTManager(app)
 
 
 register_blueprints(app)
+register_commands(app)
 
 
 @app.route("/")
@@ -0,0 +1,117 @@
+import os
+import click
+from flask.cli import with_appcontext
+from models import db, Module, Quiz
+from services.quiz_services import QuizImportService
+from services.session_store import quiz_sessions
+from services.search_service import SearchService
+from services.core_services import PathCounterService
+from services.recommendation_service import RecommendationService
+from services.community_service import CommunityService
+
+
+@click.command("import-quiz")
+@click.argument("module_id", type=int)
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--quiz-id", type=int, default=None, help="Append to an existing quiz instead of creating one.")
+@click.option("--title", default=None, help="Quiz title (overrides the document title).")
+@click.option("--passing-score", type=int, default=None)
+@click.option("--draw-count", type=int, default=None, help="Questions drawn per attempt (default: all).")
+@with_appcontext
+def import_quiz_command(module_id, path, quiz_id, title, passing_score, draw_count):
+    """Bulk-import a quiz from a JSON document or CSV file."""
+    fmt = "json" if path.lower().endswith(".json") else "csv"
+    with open(path, encoding="utf-8-sig") as f:
+        raw = f.read()
+
+    try:
+        metadata, questions = QuizImportService.parse(raw, fmt)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    if quiz_id:
+        quiz = Quiz.query.filter_by(id=quiz_id, module_id=module_id).first()
+        if not quiz:
+            raise click.ClickException(f"Quiz {quiz_id} not found in module {module_id}")
+    else:
+        if not db.session.get(Module, module_id):
+            raise click.ClickException(f"Module {module_id} not found")
+        quiz_title = title or metadata.get("title") or os.path.splitext(os.path.basename(path))[0]
+        try:
+            passing_score = passing_score or int(metadata.get("passing_score", 70))
+            if draw_count is None and metadata.get("draw_count") not in (None, ""):
+                draw_count = int(metadata["draw_count"])
+        except (TypeError, ValueError):
+            raise click.ClickException("passing_score and draw_count must be integers")
+        if draw_count is not None and not 1 <= draw_count <= len(questions):
+            raise click.ClickException(f"draw_count must be between 1 and the number of questions ({len(questions)})")
+        quiz = Quiz(
+            title=quiz_title,
+            module_id=module_id,
+            passing_score=passing_score,
+            draw_count=draw_count
+        )
+
+    question_ids = QuizImportService.import_questions(quiz, questions)
+    click.echo(f"Imported {len(question_ids)} questions into quiz {quiz.id} ({quiz.title})")
+
+
+@click.command("sweep-quiz-sessions")
+@with_appcontext
+def sweep_quiz_sessions_command():
+    """Evict expired quiz sessions from the shared session store."""
+    removed = quiz_sessions.sweep()
+    click.echo(f"Removed {removed} expired quiz sessions")
+
+
+@click.command("rebuild-search-index")
+@with_appcontext
+def rebuild_search_index_command():
+    """Create the full-text index if needed and rebuild every document from scratch."""
+    SearchService.install()
+    learning = SearchService.reindex_learning()
+    community = SearchService.reindex_community()
+    db.session.commit()
+    click.echo(f"Indexed {learning} learning and {community} community documents")
+
+
+@click.command("repair-path-counters")
+@click.option("--path-id", "path_ids", type=int, multiple=True, help="Only repair these paths (repeatable).")
+@with_appcontext
+def repair_path_counters_command(path_ids):
+    """Recompute learning path module, contributor and follower counts."""
+    updated = PathCounterService.recompute(list(path_ids) or None)
+    db.session.commit()
+    click.echo(f"Recomputed counters for {updated} learning paths")
+
+
+@click.command("rebuild-recommendations")
+@click.option("--top-k", type=int, default=None, help="Neighbours kept per path.")
+@with_appcontext
+def rebuild_recommendations_command(top_k):
+    """Recompute "learners also followed" neighbours from path_followers."""
+    written = RecommendationService.rebuild(k=top_k)
+    click.echo(f"Stored {written} path recommendations")
+
+
+@click.command("decay-hot-scores")
+@click.option("--rebuild", is_flag=True, help="Recompute every score from recent comments instead.")
+@with_appcontext
+def decay_hot_scores_command(rebuild):
+    """Decay community hot scores to now; run this from cron every few minutes."""
+    if rebuild:
+        updated = CommunityService.rebuild_hot_scores()
+    else:
+        updated = CommunityService.decay_hot_scores()
+    db.session.commit()
+    CommunityService.invalidate_feed()
+    click.echo(f"Updated hot scores for {updated} posts")
+
+
+def register_commands(app):
+    app.cli.add_command(import_quiz_command)
+    app.cli.add_command(sweep_quiz_sessions_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(repair_path_counters_command)
+    app.cli.add_command(rebuild_recommendations_command)
+    app.cli.add_command(decay_hot_scores_command)
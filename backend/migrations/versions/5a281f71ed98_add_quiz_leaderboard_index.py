@@ -0,0 +1,30 @@
+"""Add quiz leaderboard index
+
+Revision ID: 5a281f71ed98
+Revises: 59fd05d45c00
+Create Date: 2026-10-18 23:04:27.509868
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a281f71ed98'
+down_revision = '59fd05d45c00'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_quiz_summary', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_user_quiz_summary_leaderboard',
+            ['quiz_id', sa.text('best_score DESC'), 'best_at', 'user_id'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('user_quiz_summary', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_quiz_summary_leaderboard')
@@ -0,0 +1,31 @@
+"""Index community content for search
+
+Revision ID: 89fa245ba46a
+Revises: 61a2e3371028
+Create Date: 2026-10-18 23:23:28.251684
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '89fa245ba46a'
+down_revision = '61a2e3371028'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        INSERT INTO search_document (scope, kind, ref_id, group_id, title, body, is_visible)
+        SELECT 'community', 'post', id, id, title, content, TRUE FROM community_post
+    """)
+    op.execute("""
+        INSERT INTO search_document (scope, kind, ref_id, group_id, title, body, is_visible)
+        SELECT 'community', 'comment', id, post_id, NULL, content, TRUE FROM community_comment
+    """)
+
+
+def downgrade():
+    op.execute("DELETE FROM search_document WHERE scope = 'community'")
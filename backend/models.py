@@ -29,7 +29,8 @@ path_contributors = db.Table(
 path_followers = db.Table(
     "path_followers",
     db.Column("path_id", db.Integer, db.ForeignKey("learning_path.id"), primary_key=True),
-    db.Column("user_id", db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    db.Column("user_id", db.Integer, db.ForeignKey("user.id"), primary_key=True),
+    db.Index("ix_path_followers_user_id", "user_id")
 )
 
 
@@ -56,6 +57,7 @@ class User(db.Model):
     followed_paths = db.relationship("LearningPath", secondary=path_followers, back_populates="followers")
     badges = db.relationship("UserBadge", back_populates="user", lazy="dynamic", cascade="all, delete-orphan")
     progress = db.relationship("UserProgress", back_populates="user", lazy="dynamic", cascade="all, delete-orphan")
+    path_progress = db.relationship("UserPathProgress", back_populates="user", lazy="dynamic", cascade="all, delete-orphan")
     posts = db.relationship("CommunityPost", back_populates="author", cascade="all, delete-orphan", lazy="dynamic")
     comments = db.relationship("CommunityComment", back_populates="author", cascade="all, delete-orphan", lazy="dynamic")
     leaderboard_entry = db.relationship("Leaderboard", back_populates="user", uselist=False, cascade="all, delete-orphan")
@@ -100,11 +102,19 @@ class LearningPath(db.Model):
     title = db.Column(db.String(255), nullable=False, index=True)
     description = db.Column(db.Text)
     status = db.Column(db.Enum(ContentStatusEnum), default=ContentStatusEnum.pending)
-    creator_id = db.Column(db.Integer, db.ForeignKey("user.id"))
+    creator_id = db.Column(db.Integer, db.ForeignKey("user.id"), index=True)
     reviewed_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
     rejection_reason = db.Column(db.Text, nullable=True)
     is_published = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Maintained by PathCounterService; `flask repair-path-counters` recomputes them
+    module_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    contributor_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    follower_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    # Path and module reads, written in batches by services.view_counter
+    view_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    # Log-space decayed popularity maintained by TrendingService; 0 means no activity
+    trending_score = db.Column(db.Float, default=0, server_default="0", nullable=False, index=True)
 
     # Relationships
     creator = db.relationship("User", foreign_keys=[creator_id], back_populates="created_paths")
@@ -112,6 +122,7 @@ class LearningPath(db.Model):
     contributors = db.relationship("User", secondary=path_contributors, back_populates="contributions")
     followers = db.relationship("User", secondary=path_followers, back_populates="followed_paths")
     modules = db.relationship("Module", back_populates="learning_path", lazy="dynamic", cascade="all, delete-orphan")
+    user_progress = db.relationship("UserPathProgress", back_populates="path", lazy="dynamic", cascade="all, delete-orphan")
 
     def to_dict(self):
         return {
@@ -122,8 +133,9 @@ class LearningPath(db.Model):
             'creator_id': self.creator_id,
             'is_published': self.is_published,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'module_count': self.modules.count() if self.modules else 0,
-            'contributor_count': len(self.contributors) if self.contributors else 0,
+            'module_count': self.module_count or 0,
+            'contributor_count': self.contributor_count or 0,
+            'follower_count': self.follower_count or 0,
         }
 
     
@@ -154,11 +166,16 @@ class LearningResource(db.Model):
         }
 class Module(db.Model):
     __tablename__ = "module"
+    __table_args__ = (
+        db.Index("ix_module_path_position", "learning_path_id", "position"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
     learning_path_id = db.Column(db.Integer, db.ForeignKey("learning_path.id"))
+    position = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    view_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     learning_path = db.relationship("LearningPath", back_populates="modules")
@@ -173,6 +190,7 @@ class Module(db.Model):
             'description': self.description,
             'learning_path_id': self.learning_path_id,
             'learning_path_title': self.learning_path.title if self.learning_path else None,
+            'position': self.position,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'resource_count': self.resources.count() if self.resources else 0,
             'quiz_count': self.quizzes.count() if self.quizzes else 0
@@ -186,6 +204,10 @@ class Quiz(db.Model):
     title = db.Column(db.String(255), nullable=False)
     module_id = db.Column(db.Integer, db.ForeignKey("module.id"))
     passing_score = db.Column(db.Integer, default=70)
+    cache_version = db.Column(db.Integer, default=1, server_default="1", nullable=False)
+    draw_count = db.Column(db.Integer, nullable=True)  # questions drawn per attempt, None = all
+    question_ids = db.Column(db.JSON, nullable=True)  # precomputed question bank
+    time_limit_seconds = db.Column(db.Integer, nullable=True)
 
     module = db.relationship("Module", back_populates="quizzes")
     questions = db.relationship("Question", back_populates="quiz", lazy="dynamic", cascade="all, delete-orphan")
@@ -197,6 +219,8 @@ class Quiz(db.Model):
             'module_id': self.module_id,
             'module_title': self.module.title if self.module else None,
             'passing_score': self.passing_score,
+            'draw_count': self.draw_count,
+            'time_limit_seconds': self.time_limit_seconds,
             'question_count': self.questions.count() if self.questions else 0
         }
 
@@ -252,6 +276,9 @@ class Choice(db.Model):
     
 class UserQuizAttempt(db.Model):
     __tablename__ = "user_quiz_attempt"
+    __table_args__ = (
+        db.Index("ix_user_quiz_attempt_user_quiz", "user_id", "quiz_id", "id"),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"))
@@ -260,11 +287,44 @@ class UserQuizAttempt(db.Model):
     passed = db.Column(db.Boolean)
     started_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime)
+    drawn_question_ids = db.Column(db.JSON, nullable=True)
     
     user = db.relationship("User", backref="quiz_attempts")
     quiz = db.relationship("Quiz", backref="attempts")
     answers = db.relationship("UserQuizAnswer", back_populates="attempt", cascade="all, delete-orphan")
 
+class UserQuizSummary(db.Model):
+    """Per-(user, quiz) rollup maintained at grading time."""
+    __tablename__ = "user_quiz_summary"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "quiz_id", name="uq_user_quiz_summary_user_quiz"),
+        db.Index("ix_user_quiz_summary_leaderboard", "quiz_id", db.desc("best_score"), "best_at", "user_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey("quiz.id"), nullable=False)
+    attempt_count = db.Column(db.Integer, default=0, nullable=False)
+    best_score = db.Column(db.Integer, nullable=True)
+    best_at = db.Column(db.DateTime, nullable=True)  # when best_score was first reached
+    last_score = db.Column(db.Integer, nullable=True)
+    last_attempt_at = db.Column(db.DateTime, nullable=True)
+    passed_at = db.Column(db.DateTime, nullable=True)  # first passing attempt
+
+    user = db.relationship("User")
+    quiz = db.relationship("Quiz")
+
+    def to_dict(self):
+        return {
+            'quiz_id': self.quiz_id,
+            'attempt_count': self.attempt_count,
+            'best_score': self.best_score,
+            'last_score': self.last_score,
+            'last_attempt_at': self.last_attempt_at.isoformat() if self.last_attempt_at else None,
+            'passed_at': self.passed_at.isoformat() if self.passed_at else None
+        }
+
+
 class UserQuizAnswer(db.Model):
     __tablename__ = "user_quiz_answer"
     
@@ -305,15 +365,54 @@ class UserProgress(db.Model):
             'completed_at': self.completed_at.isoformat() if self.completed_at else None
         }
 
+class UserPathProgress(db.Model):
+    """Per-user learning path completion, maintained as module progress changes."""
+    __tablename__ = "user_path_progress"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "path_id", name="uq_user_path_progress_user_path"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    path_id = db.Column(db.Integer, db.ForeignKey("learning_path.id"), nullable=False, index=True)
+    completed_modules = db.Column(db.Integer, default=0, nullable=False)
+    total_modules = db.Column(db.Integer, default=0, nullable=False)
+    percent = db.Column(db.Integer, default=0, nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user = db.relationship("User", back_populates="path_progress")
+    path = db.relationship("LearningPath", back_populates="user_progress")
+
+    def to_dict(self):
+        return {
+            'path_id': self.path_id,
+            'completed_modules': self.completed_modules,
+            'total_modules': self.total_modules,
+            'percent': self.percent,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
+
 # Community 
 class CommunityPost(db.Model):
     __tablename__ = "community_post"
+    __table_args__ = (
+        db.Index("ix_community_post_created_id", "created_at", "id"),
+        db.Index("ix_community_post_hot", "hot_score", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     author_id = db.Column(db.Integer, db.ForeignKey("user.id"))
     title = db.Column(db.String(255), nullable=False)
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Maintained by CommunityService whenever comments are added or removed
+    comment_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    # Decayed comment velocity as of hot_scored_at; see CommunityService.decay_hot_scores
+    hot_score = db.Column(db.Float, default=0, server_default="0", nullable=False)
+    hot_scored_at = db.Column(db.DateTime)
+    # Set when moderation upholds a report; hidden posts leave the feed and search
+    is_hidden = db.Column(db.Boolean, default=False, server_default=db.false(), nullable=False)
 
     author = db.relationship("User", back_populates="posts")
     comments = db.relationship("CommunityComment", back_populates="post", cascade="all, delete-orphan", lazy="dynamic")
@@ -326,11 +425,15 @@ class CommunityPost(db.Model):
             'title': self.title,
             'content': self.content,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'comment_count': self.comments.count() if self.comments else 0
+            'comment_count': self.comment_count or 0,
+            'is_hidden': self.is_hidden
         }
 
 class CommunityComment(db.Model):
     __tablename__ = "community_comment"
+    __table_args__ = (
+        db.Index("ix_community_comment_post_created_id", "post_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     post_id = db.Column(db.Integer, db.ForeignKey("community_post.id"))
@@ -530,6 +633,9 @@ class PointsLog(db.Model):
     
 class ContentFlag(db.Model):
     __tablename__ = "content_flag"
+    __table_args__ = (
+        db.Index("ix_content_flag_status_created", "status", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     reporter_id = db.Column(db.Integer, db.ForeignKey("user.id"))
@@ -537,11 +643,14 @@ class ContentFlag(db.Model):
     comment_id = db.Column(db.Integer, db.ForeignKey("community_comment.id"), nullable=True)
     reason = db.Column(db.String(255))
     status = db.Column(db.Enum(ContentStatusEnum), default=ContentStatusEnum.pending)
+    admin_notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    review_item_id = db.Column(db.Integer, db.ForeignKey("review_item.id"), index=True)
 
     reporter = db.relationship("User")
     post = db.relationship("CommunityPost")
     comment = db.relationship("CommunityComment")
+    review_item = db.relationship("ReviewItem", back_populates="flags")
 
     def to_dict(self):
         return {
@@ -557,8 +666,47 @@ class ContentFlag(db.Model):
             ),
             'reason': self.reason,
             'status': self.status.value,
+            'admin_notes': self.admin_notes,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+class ReviewItem(db.Model):
+    """All reports against one post or comment, reviewed as a unit; see ReviewQueueService."""
+    __tablename__ = "review_item"
+    __table_args__ = (
+        db.UniqueConstraint("content_type", "content_id", name="uq_review_item_content"),
+        db.Index("ix_review_item_status_priority", "status", "priority"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    content_type = db.Column(db.String(20), nullable=False)  # post or comment
+    content_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.Enum(ContentStatusEnum), default=ContentStatusEnum.pending, nullable=False)
+    report_count = db.Column(db.Integer, default=0, nullable=False)
+    reporter_count = db.Column(db.Integer, default=0, nullable=False)
+    first_reported_at = db.Column(db.DateTime)
+    last_reported_at = db.Column(db.DateTime)
+    priority = db.Column(db.Float, default=0, nullable=False)
+    resolved_by_id = db.Column(db.Integer, db.ForeignKey("user.id"))
+    resolved_at = db.Column(db.DateTime)
+    admin_notes = db.Column(db.Text)
+
+    flags = db.relationship("ContentFlag", back_populates="review_item", lazy="dynamic")
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'content_type': self.content_type,
+            'content_id': self.content_id,
+            'status': self.status.value,
+            'report_count': self.report_count,
+            'reporter_count': self.reporter_count,
+            'first_reported_at': self.first_reported_at.isoformat() if self.first_reported_at else None,
+            'last_reported_at': self.last_reported_at.isoformat() if self.last_reported_at else None,
+            'priority': self.priority,
+            'resolved_at': self.resolved_at.isoformat() if self.resolved_at else None,
+            'admin_notes': self.admin_notes
+        }
+
 class UserModeration(db.Model):
     __tablename__ = "user_moderation"
 
@@ -581,4 +729,36 @@ class UserModeration(db.Model):
             'action': self.action,
             'reason': self.reason,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        }
+class SearchDocument(db.Model):
+    """Searchable text for one piece of content; the full-text index is built on this table."""
+    __tablename__ = "search_document"
+    __table_args__ = (
+        db.UniqueConstraint("kind", "ref_id", name="uq_search_document_kind_ref"),
+        db.Index("ix_search_document_scope_group", "scope", "group_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(20), nullable=False)  # learning, community
+    kind = db.Column(db.String(20), nullable=False)  # path, module, resource, post, comment
+    ref_id = db.Column(db.Integer, nullable=False)
+    group_id = db.Column(db.Integer, nullable=True)  # owning learning path / community post
+    parent_id = db.Column(db.Integer, nullable=True)  # owning module for resources
+    title = db.Column(db.String(255))
+    body = db.Column(db.Text)
+    is_visible = db.Column(db.Boolean, default=True, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class PathRecommendation(db.Model):
+    """Top co-followed neighbours of a learning path, rebuilt by `flask rebuild-recommendations`."""
+    __tablename__ = "path_recommendation"
+    __table_args__ = (
+        db.UniqueConstraint("path_id", "rank", name="uq_path_recommendation_path_rank"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    path_id = db.Column(db.Integer, db.ForeignKey("learning_path.id", ondelete="CASCADE"), nullable=False)
+    recommended_path_id = db.Column(db.Integer, db.ForeignKey("learning_path.id", ondelete="CASCADE"), nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float, nullable=False)  # Jaccard similarity of the two follower sets
+    co_followers = db.Column(db.Integer, nullable=False)
@@ -51,6 +51,7 @@ def register():
 
     access_token = create_access_token(
       identity=str(new_user.id),
+        additional_claims={"role": new_user.role.value},
         expires_delta=timedelta(hours=8)
     )
 
@@ -91,6 +92,7 @@ def login():
     # Create JWT token (identity as string to avoid errors)
     access_token = create_access_token(
         identity=str(user.id),
+        additional_claims={"role": user.role.value},
         expires_delta=timedelta(hours=8)
     )
 
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from sqlalchemy import func, and_, or_
 from models import db, UserChallenge, ChallengeParticipation, PlatformEvent, User, PointsLog
 from services.core_services import PointsService
+from services.quiz_services import QuizService
 from utils.role_required import role_required
 
 challenges_bp = Blueprint('challenges_bp', __name__)
@@ -407,4 +408,26 @@ def get_challenge_leaderboard(challenge_id):
             "leaderboard": leaderboard_data
         }), 200
     except Exception as e:
-        return jsonify({"error": f"Failed to load leaderboard: {str(e)}"}), 500
\ No newline at end of file
+        return jsonify({"error": f"Failed to load leaderboard: {str(e)}"}), 500
+
+
+@challenges_bp.route('/<int:challenge_id>/quiz-leaderboard', methods=['GET'])
+def get_challenge_quiz_leaderboard(challenge_id):
+    challenge = UserChallenge.query.get_or_404(challenge_id)
+    try:
+        if not challenge.quiz:
+            return jsonify({"error": "This challenge has no linked quiz"}), 404
+
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        try:
+            page = QuizService.get_leaderboard_page(challenge.quiz, request.args.get('cursor'), limit)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify({
+            "challenge_id": challenge_id,
+            "challenge_title": challenge.title,
+            **page
+        }), 200
+    except Exception as e:
+        return jsonify({"error": f"Failed to load leaderboard: {str(e)}"}), 500
@@ -1,17 +1,35 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import json
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from models import db, User, CommunityPost, CommunityComment, RoleEnum
 from utils.role_required import role_required
+from services.community_service import CommunityService, FEED_CACHE
+from services.search_service import SearchService
+from utils.cache import shared_cache
+from utils.constants import RESPONSE_CACHE_CONFIG, CONTENT_PREVIEW_CONFIG
 
 community_bp = Blueprint("community_bp", __name__)
 
+COMMENT_STREAM_BATCH = 500
+
+
+def get_current_identity():
+    """Return (user_id, role) for the caller; older tokens without a role claim cost one lookup."""
+    identity = get_jwt_identity()
+    user_id = int(identity["id"] if isinstance(identity, dict) else identity)
+    role = get_jwt().get("role")
+    if role is None:
+        user_role = db.session.query(User.role).filter_by(id=user_id).scalar()
+        role = user_role.value if user_role else None
+    return user_id, role
+
 # Create a community post
 @community_bp.route("/posts", methods=["POST"])
 @jwt_required()
 @role_required("admin", "contributor")  
 def create_post():
     try:
-        current_user = get_jwt_identity()
+        user_id, _ = get_current_identity()
         data = request.get_json()
 
         title = data.get("title", "").strip()
@@ -28,10 +46,12 @@ def create_post():
         post = CommunityPost(
             title=title,
             content=content,
-            author_id=current_user["id"]
+            author_id=user_id
         )
         db.session.add(post)
+        SearchService.index_post(post)
         db.session.commit()
+        CommunityService.invalidate_feed()
 
         return jsonify({
             "message": "Post created successfully",
@@ -49,60 +69,217 @@ def create_post():
         return jsonify({"error": "Failed to create post"}), 500
 
 # Get all posts (with pagination) 
+# ?cursor= (empty for the first page) switches to keyset paging over
+# (created_at, id); pass include_total=true to also get the post count.
+# ?sort=hot ranks by decayed comment velocity (page mode only).
 @community_bp.route("/posts", methods=["GET"])
 def get_posts():
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 10, type=int)
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 10, type=int), 1), 100)
+    cursor = request.args.get("cursor")
+    include_total = request.args.get("include_total", "").lower() in ("1", "true")
+    sort = "hot" if request.args.get("sort") == "hot" else "new"
 
-    pagination = CommunityPost.query.order_by(CommunityPost.created_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    if sort == "hot" and cursor is not None:
+        return jsonify({"error": "Cursor paging is only available for the newest-first feed"}), 400
 
-    posts = []
-    for post in pagination.items:
-        posts.append({
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "author": post.author.username,
-            "created_at": post.created_at.isoformat(),
-            "comments_count": post.comments.count()
-        })
+    # The first few pages are identical for every visitor, so they are kept as
+    # encoded JSON in the shared cache and written back to the socket as is.
+    cache_key = None
+    if cursor is None and page <= RESPONSE_CACHE_CONFIG['feed_cached_pages']:
+        cache_key = f"page:{sort}:{page}:{per_page}"
+    elif cursor == "" and not include_total:
+        cache_key = f"cursor:{per_page}"
 
-    return jsonify({
-        "posts": posts,
+    if cache_key:
+        cached, generation = shared_cache.get(FEED_CACHE, cache_key)
+        if cached is not None:
+            return Response(cached, mimetype=current_app.json.mimetype), 200
+
+    try:
+        feed = _build_feed(page, per_page, cursor, include_total, sort)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    body = current_app.json.dumps(feed).encode()
+    if cache_key:
+        shared_cache.set(FEED_CACHE, cache_key, body, generation, RESPONSE_CACHE_CONFIG['feed_ttl_seconds'])
+    return Response(body, mimetype=current_app.json.mimetype), 200
+
+
+def _build_feed(page, per_page, cursor, include_total, sort):
+    # Authors come from a join and comment counts from the maintained column,
+    # so a page is one statement at any size. `content` holds a preview cut in
+    # SQL and flagged by is_truncated; get_single_post serves the full text.
+    query = db.session.query(
+        CommunityPost.id,
+        CommunityPost.title,
+        *CommunityService.preview_columns(CommunityPost.content, CONTENT_PREVIEW_CONFIG['feed_chars']),
+        CommunityPost.created_at,
+        CommunityPost.comment_count,
+        User.username
+    ).outerjoin(User, User.id == CommunityPost.author_id).filter(CommunityPost.is_hidden == False)
+
+    if cursor is not None:
+        rows, next_cursor = CommunityService.keyset_page(
+            query, CommunityPost.created_at, CommunityPost.id, cursor, per_page
+        )
+        feed = {"posts": _serialize_feed(rows), "next_cursor": next_cursor}
+        if include_total:
+            feed["total"] = CommunityPost.query.filter_by(is_hidden=False).count()
+        return feed
+
+    # Both orders walk an index: ix_community_post_hot or ix_community_post_created_id
+    if sort == "hot":
+        order = (CommunityPost.hot_score.desc(), CommunityPost.created_at.desc(), CommunityPost.id.desc())
+    else:
+        order = (CommunityPost.created_at.desc(), CommunityPost.id.desc())
+
+    pagination = query.order_by(*order).paginate(page=page, per_page=per_page, error_out=False)
+
+    return {
+        "posts": _serialize_feed(pagination.items),
         "total": pagination.total,
         "pages": pagination.pages,
         "current_page": pagination.page
-    }), 200
+    }
+
 
-# Get a single post and its comments 
+def _serialize_feed(rows):
+    return [{
+        "id": post_id,
+        "title": title,
+        "content": CommunityService.format_preview(preview, truncated),
+        "is_truncated": bool(truncated),
+        "author": username,
+        "created_at": created_at.isoformat(),
+        "comments_count": comment_count
+    } for post_id, title, preview, truncated, created_at, comment_count, username in rows]
+
+# Get a single post and the first page of its comments 
 @community_bp.route("/posts/<int:post_id>", methods=["GET"])
 def get_single_post(post_id):
-    post = CommunityPost.query.get_or_404(post_id)
+    limit = min(max(request.args.get("limit", 50, type=int), 1), 200)
+    row = db.session.query(CommunityPost, User.username).outerjoin(
+        User, User.id == CommunityPost.author_id
+    ).filter(CommunityPost.id == post_id, CommunityPost.is_hidden == False).first()
+    if row is None:
+        return jsonify({"error": "Post not found"}), 404
+    post, author = row
+
+    comments, next_cursor = CommunityService.keyset_page(
+        _comment_query(post_id), CommunityComment.created_at, CommunityComment.id,
+        None, limit, newest_first=False
+    )
 
     return jsonify({
         "id": post.id,
         "title": post.title,
         "content": post.content,
-        "author": post.author.username,
+        "author": author,
         "created_at": post.created_at.isoformat(),
-        "comments": [
-            {
-                "id": c.id,
-                "content": c.content,
-                "author": c.author.username,
-                "created_at": c.created_at.isoformat()
-            } for c in post.comments.order_by(CommunityComment.created_at.asc()).all()
-        ]
+        "comments_count": post.comment_count,
+        "comments": [_serialize_comment(c) for c in comments],
+        "next_cursor": next_cursor
     }), 200
 
+# Get a post's comments, oldest first 
+# ?cursor= continues from a previous page; ?format=ndjson streams the whole
+# thread one comment per line without building it in memory.
+@community_bp.route("/posts/<int:post_id>/comments", methods=["GET"])
+def get_post_comments(post_id):
+    if not db.session.query(CommunityPost.id).filter_by(id=post_id, is_hidden=False).scalar():
+        return jsonify({"error": "Post not found"}), 404
+
+    if request.args.get("format") == "ndjson":
+        stmt = _comment_query(post_id).order_by(CommunityComment.created_at, CommunityComment.id).statement
+        rows = db.session.execute(stmt.execution_options(yield_per=COMMENT_STREAM_BATCH))
+
+        def generate():
+            for comment in rows:
+                yield json.dumps(_serialize_comment(comment)) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    limit = min(max(request.args.get("limit", 50, type=int), 1), 200)
+    try:
+        comments, next_cursor = CommunityService.keyset_page(
+            _comment_query(post_id), CommunityComment.created_at, CommunityComment.id,
+            request.args.get("cursor"), limit, newest_first=False
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "comments": [_serialize_comment(c) for c in comments],
+        "next_cursor": next_cursor
+    }), 200
+
+
+def _comment_query(post_id):
+    return db.session.query(
+        CommunityComment.id,
+        CommunityComment.content,
+        CommunityComment.created_at,
+        User.username
+    ).outerjoin(User, User.id == CommunityComment.author_id).filter(CommunityComment.post_id == post_id)
+
+
+def _serialize_comment(comment):
+    return {
+        "id": comment.id,
+        "content": comment.content,
+        "author": comment.username,
+        "created_at": comment.created_at.isoformat()
+    }
+
+# Search posts and comments 
+@community_bp.route("/search", methods=["GET"])
+def search_community():
+    q = request.args.get("q", "").strip()
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 50)
+
+    if not q:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+
+    try:
+        total, hits, next_cursor = SearchService.search(
+            "community", q, limit=limit, cursor=request.args.get("cursor") or None,
+            with_total=request.args.get("include_total", "").lower() in ("1", "true")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Search failed: {str(e)}"}), 500
+
+    # Comment hits carry their post's title from one lookup for the whole page
+    post_ids = {hit["group_id"] for hit in hits if hit["type"] == "comment"}
+    post_titles = dict(
+        db.session.query(CommunityPost.id, CommunityPost.title).filter(CommunityPost.id.in_(post_ids)).all()
+    ) if post_ids else {}
+
+    response = {
+        "query": q,
+        "results": [{
+            "type": hit["type"],
+            "id": hit["id"],
+            "post_id": hit["group_id"],
+            "post_title": hit["title"] if hit["type"] == "post" else post_titles.get(hit["group_id"]),
+            "snippet": hit["snippet"],
+            "score": hit["score"]
+        } for hit in hits],
+        "next_cursor": next_cursor
+    }
+    if total is not None:
+        response["total"] = total
+    return jsonify(response), 200
+
 #Add a comment to a post
 @community_bp.route("/posts/<int:post_id>/comments", methods=["POST"])
 @jwt_required()
 def add_comment(post_id):
     try:
-        current_user = get_jwt_identity()
+        user_id, _ = get_current_identity()
         data = request.get_json()
         content = data.get("content", "").strip()
 
@@ -112,14 +289,17 @@ def add_comment(post_id):
         if len(content) < 3:
             return jsonify({"error": "Comment must be at least 3 characters"}), 400
 
-        post = CommunityPost.query.get_or_404(post_id)
+        post = CommunityPost.query.filter_by(id=post_id, is_hidden=False).first_or_404()
         comment = CommunityComment(
             content=content,
             post_id=post.id,
-            author_id=current_user["id"]
+            author_id=user_id
         )
         db.session.add(comment)
+        CommunityService.comment_added(post.id)
+        SearchService.index_comment(comment)
         db.session.commit()
+        CommunityService.invalidate_feed()
 
         return jsonify({
             "message": "Comment added",
@@ -139,26 +319,29 @@ def add_comment(post_id):
 @community_bp.route("/posts/<int:post_id>", methods=["DELETE"])
 @jwt_required()
 def delete_post(post_id):
-    current_user = get_jwt_identity()
+    user_id, role = get_current_identity()
     post = CommunityPost.query.get_or_404(post_id)
 
-    if current_user["role"] != "admin" and post.author_id != current_user["id"]:
+    if role != RoleEnum.admin.value and post.author_id != user_id:
         return jsonify({"error": "Not authorized"}), 403
 
+    SearchService.remove_group("community", post.id)
     db.session.delete(post)
     db.session.commit()
+    CommunityService.invalidate_feed()
     return jsonify({"message": "Post deleted"}), 200
 
 # Delete a comment (admin or comment owner) 
 @community_bp.route("/comments/<int:comment_id>", methods=["DELETE"])
 @jwt_required()
 def delete_comment(comment_id):
-    current_user = get_jwt_identity()
+    user_id, role = get_current_identity()
     comment = CommunityComment.query.get_or_404(comment_id)
 
-    if current_user["role"] != "admin" and comment.author_id != current_user["id"]:
+    if role != RoleEnum.admin.value and comment.author_id != user_id:
         return jsonify({"error": "Not authorized"}), 403
 
-    db.session.delete(comment)
+    CommunityService.delete_comments([comment.id])
     db.session.commit()
+    CommunityService.invalidate_feed()
     return jsonify({"message": "Comment deleted"}), 200
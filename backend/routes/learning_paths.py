@@ -1,12 +1,21 @@
+import json
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, verify_jwt_in_request
 from datetime import datetime
-from models import db, LearningPath, ContentStatusEnum, User, UserProgress, Module, LearningResource, Quiz, UserQuizAttempt, Question
+from sqlalchemy import func, and_, case, exists
+from models import db, path_followers, RoleEnum, LearningPath, ContentStatusEnum, User, UserProgress, UserPathProgress, Module, LearningResource, Quiz, UserQuizAttempt, UserQuizSummary, Question
 from utils.role_required import role_required
-from services.core_services import PointsService
+from services.core_services import PointsService, PathProgressService, PathCounterService, TrendingService
+from services.search_service import SearchService
+from services.view_counter import view_counter
+from services.recommendation_service import RecommendationService
+from utils.cache import shared_cache
+from utils.constants import RESPONSE_CACHE_CONFIG
 
 learning_paths_bp = Blueprint('learning_paths_bp', __name__)
 
+CATALOGUE_CACHE = "catalogue"
+
 
 def get_current_user():
     identity = get_jwt_identity()
@@ -44,7 +53,9 @@ def create_learning_path():
         )
         
         db.session.add(new_path)
+        SearchService.index_path(new_path)
         db.session.commit()
+        invalidate_catalogue()
         
         return jsonify({
             "message": "Learning path created successfully",
@@ -63,47 +74,144 @@ def create_learning_path():
 # GET All Published Learning Paths
 @learning_paths_bp.route("/paths", methods=["GET"])
 def get_learning_paths():
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 10, type=int)
+    # Same bounds paginate(error_out=False) applied before the catalogue used a raw offset
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 10, type=int), 1), 100)
     status_filter = request.args.get("status")
+    sort = "trending" if request.args.get("sort") == "trending" else "id"
 
-    current_user = None
+    user_id, role = None, None
     try:
         verify_jwt_in_request(optional=True)
         identity = get_jwt_identity()
         if identity:
-            user_id = identity["id"] if isinstance(identity, dict) else identity
-            current_user = User.query.get(user_id)
-    except:
+            user_id = int(identity["id"] if isinstance(identity, dict) else identity)
+            # Role travels in the token; older tokens fall back to a single column lookup
+            role = get_jwt().get("role")
+            if role is None:
+                user_role = db.session.query(User.role).filter_by(id=user_id).scalar()
+                role = user_role.value if user_role else None
+    except Exception:
         pass
 
-    query = LearningPath.query
+    # The catalogue page is shared by every caller with the same visibility;
+    # only the caller's follow flags are computed per request.
+    visibility = "all" if role == RoleEnum.admin.value else "published"
+    filter_key = (status_filter or "") if visibility == "all" else ""
+    cache_key = f"{visibility}:{filter_key}:{sort}:{page}:{per_page}"
+    namespace = TrendingService.CACHE_NAMESPACE if sort == "trending" else CATALOGUE_CACHE
+    cached, generation = shared_cache.get(namespace, cache_key)
+    if cached is None:
+        catalogue = _build_catalogue(visibility, status_filter, sort, page, per_page)
+        shared_cache.set(namespace, cache_key, json.dumps(catalogue).encode(), generation,
+                         RESPONSE_CACHE_CONFIG['catalogue_ttl_seconds'])
+    else:
+        catalogue = json.loads(cached)
+
+    followed = set()
+    if user_id and catalogue["paths"]:
+        followed = {path_id for (path_id,) in db.session.query(path_followers.c.path_id).filter(
+            path_followers.c.user_id == user_id,
+            path_followers.c.path_id.in_([p["id"] for p in catalogue["paths"]])
+        )}
+
+    return jsonify({
+        "page": page,
+        "per_page": per_page,
+        "total": catalogue["total"],
+        "paths": [dict(p, is_following=p["id"] in followed) for p in catalogue["paths"]]
+    })
+
+
+def _build_catalogue(visibility, status_filter, sort, page, per_page):
+    base = LearningPath.query
 
     # Only admins can see unpublished paths
-    if not (current_user and current_user.role == "admin"):
-        query = query.filter(LearningPath.is_published == True)
+    if visibility != "all":
+        base = base.filter(LearningPath.is_published == True)
     elif status_filter:
         if status_filter == "published":
-            query = query.filter(LearningPath.is_published == True)
+            base = base.filter(LearningPath.is_published == True)
         elif status_filter == "pending":
-            query = query.filter(LearningPath.is_published == False)
+            base = base.filter(LearningPath.is_published == False)
+
+    total = base.count()
+
+    # trending walks the trending_score index; see TrendingService
+    if sort == "trending":
+        order = (LearningPath.trending_score.desc(), LearningPath.id)
+    else:
+        order = (LearningPath.id,)
+
+    rows = base.with_entities(
+        LearningPath.id,
+        LearningPath.title,
+        LearningPath.description,
+        LearningPath.is_published,
+        LearningPath.module_count,
+        LearningPath.follower_count
+    ).order_by(*order).limit(per_page).offset((page - 1) * per_page).all()
+
+    return {
+        "total": total,
+        "paths": [{
+            "id": path_id,
+            "title": title,
+            "description": description,
+            "is_published": is_published,
+            "module_count": module_count,
+            "follower_count": follower_count
+        } for path_id, title, description, is_published, module_count, follower_count in rows]
+    }
+
+
+def invalidate_catalogue():
+    """Drop cached catalogue pages in every worker; call after committing."""
+    shared_cache.invalidate(CATALOGUE_CACHE)
+    TrendingService.invalidate_pages()
+
+# GET Search Learning Paths, Modules and Resources
+@learning_paths_bp.route("/search", methods=["GET"])
+def search_learning_content():
+    q = request.args.get("q", "").strip()
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 10, type=int), 1), 50)
+
+    if not q:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+
+    role = None
+    try:
+        verify_jwt_in_request(optional=True)
+        role = get_jwt().get("role")
+    except Exception:
+        pass
 
-    paths_paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-    
-    paths_list = [{
-        "id": lp.id,
-        "title": lp.title,
-        "description": lp.description,
-        "is_published": lp.is_published,
-        "is_following": lp in current_user.followed_paths if current_user else False
-    } for lp in paths_paginated.items]
+    try:
+        total, hits, _ = SearchService.search(
+            "learning", q, limit=per_page, offset=(page - 1) * per_page,
+            include_hidden=role == RoleEnum.admin.value
+        )
+    except Exception as e:
+        return jsonify({"error": f"Search failed: {str(e)}"}), 500
+
+    results = [{
+        "type": hit["type"],
+        "id": hit["id"],
+        "path_id": hit["group_id"],
+        "module_id": hit["id"] if hit["type"] == "module" else hit["parent_id"],
+        "title": hit["title"],
+        "snippet": hit["snippet"],
+        "score": hit["score"]
+    } for hit in hits]
 
     return jsonify({
+        "query": q,
         "page": page,
         "per_page": per_page,
-        "total": paths_paginated.total,
-        "paths": paths_list
-    })
+        "total": total,
+        "results": results
+    }), 200
 
 # GET Modules for a Learning Path
 @learning_paths_bp.route('/<int:path_id>/modules', methods=['GET'])
@@ -114,35 +222,58 @@ def get_path_modules(path_id):
         user, user_id = get_current_user()
         
         # Check permissions
-        if int(path.creator_id) != int(user_id) and user.role != "admin":
+        if int(path.creator_id) != int(user_id) and user.role != RoleEnum.admin:
             if not path.is_published:
                 return jsonify({"error": "Access denied"}), 403
         
-        modules = Module.query.filter_by(learning_path_id=path_id).order_by(Module.id).all()
+        # Grouped counts for this path's modules, the caller's progress rows and
+        # whether the caller follows the path, all in one statement.
+        resource_counts = db.session.query(
+            LearningResource.module_id, func.count(LearningResource.id).label("resource_count")
+        ).join(Module, Module.id == LearningResource.module_id).filter(
+            Module.learning_path_id == path_id
+        ).group_by(LearningResource.module_id).subquery()
+        quiz_counts = db.session.query(
+            Quiz.module_id, func.count(Quiz.id).label("quiz_count")
+        ).join(Module, Module.id == Quiz.module_id).filter(
+            Module.learning_path_id == path_id
+        ).group_by(Quiz.module_id).subquery()
+        is_following = exists().where(
+            path_followers.c.path_id == path_id, path_followers.c.user_id == user_id
+        )
+        
+        rows = db.session.query(
+            Module.id,
+            Module.title,
+            Module.description,
+            func.coalesce(resource_counts.c.resource_count, 0),
+            func.coalesce(quiz_counts.c.quiz_count, 0),
+            UserProgress.completion_percent,
+            is_following.label("is_following")
+        ).outerjoin(
+            resource_counts, resource_counts.c.module_id == Module.id
+        ).outerjoin(
+            quiz_counts, quiz_counts.c.module_id == Module.id
+        ).outerjoin(
+            UserProgress, and_(UserProgress.module_id == Module.id, UserProgress.user_id == user_id)
+        ).filter(
+            Module.learning_path_id == path_id
+        ).order_by(Module.position, Module.id).all()
         
         modules_list = []
-        for module in modules:
-            resource_count = LearningResource.query.filter_by(module_id=module.id).count()
-            quiz_count = Quiz.query.filter_by(module_id=module.id).count()
-            
-            module_dict = {
-                "id": module.id,
-                "title": module.title,
-                "description": module.description,
+        for module_id, title, description, resource_count, quiz_count, completion, following in rows:
+            completion = (completion or 0) if following else 0
+            modules_list.append({
+                "id": module_id,
+                "title": title,
+                "description": description,
                 "resource_count": resource_count,
-                "quiz_count": quiz_count
-            }
-            
-            if path in user.followed_paths:
-                progress = UserProgress.query.filter_by(user_id=user_id, module_id=module.id).first()
-                module_dict["is_completed"] = progress.completion_percent == 100 if progress else False
-                module_dict["completion_percent"] = progress.completion_percent if progress else 0
-            else:
-                module_dict["is_completed"] = False
-                module_dict["completion_percent"] = 0
-            
-            modules_list.append(module_dict)
+                "quiz_count": quiz_count,
+                "is_completed": completion == 100,
+                "completion_percent": completion
+            })
         
+        view_counter.record_path(path.id)
         return jsonify(modules_list), 200
     except Exception as e:
         return jsonify({"error": f"Failed to fetch modules: {str(e)}"}), 500
@@ -168,9 +299,19 @@ def create_module(path_id):
         if not title or len(title) < 3:
             return jsonify({"error": "Module title must be at least 3 characters"}), 400
         
-        new_module = Module(title=title, description=description, learning_path_id=path_id)
+        last_position = db.session.query(func.max(Module.position)).filter_by(learning_path_id=path_id).scalar()
+        new_module = Module(
+            title=title,
+            description=description,
+            learning_path_id=path_id,
+            position=(last_position or 0) + 1
+        )
         db.session.add(new_module)
+        PathProgressService.module_added(path_id)
+        PathCounterService.adjust(path_id, module_count=1)
+        SearchService.index_module(new_module, path)
         db.session.commit()
+        invalidate_catalogue()
         
         return jsonify({
             "message": "Module created successfully",
@@ -193,43 +334,91 @@ def get_module_details(module_id):
         has_access = (
             path.is_published or 
             int(path.creator_id) == int(user_id) or 
-            user.role == "admin" or 
-            path in user.followed_paths
+            user.role == RoleEnum.admin or 
+            db.session.query(exists().where(
+                path_followers.c.path_id == path.id, path_followers.c.user_id == user_id
+            )).scalar()
         )
         if not has_access:
             return jsonify({"error": "Access denied"}), 403
         
-        # Get resources
-        resources = LearningResource.query.filter_by(module_id=module_id).all()
+        # Get resources (the heavy `content` column is only served by the resource endpoint)
+        resources = db.session.query(
+            LearningResource.id, LearningResource.title, LearningResource.type,
+            LearningResource.url, LearningResource.description
+        ).filter(LearningResource.module_id == module_id).order_by(LearningResource.id).all()
         resources_list = [{
             "id": r.id,
             "title": r.title,
             "type": r.type,
             "url": r.url,
-            "description": getattr(r, 'description', None)
+            "description": r.description
         } for r in resources]
         
-        # Get quizzes - SIMPLIFIED
-        quizzes = Quiz.query.filter_by(module_id=module_id).all()
-        quizzes_list = []
-        for quiz in quizzes:
-            question_count = Question.query.filter_by(quiz_id=quiz.id).count()
-            user_attempt = UserQuizAttempt.query.filter_by(
-                user_id=user_id, quiz_id=quiz.id
-            ).first()  # Just get any attempt
-            
-            quizzes_list.append({
-                "id": quiz.id,
-                "title": quiz.title,
-                "description": getattr(quiz, 'description', None),
-                "question_count": question_count,
-                "has_attempted": user_attempt is not None,
-                "last_score": user_attempt.score if user_attempt else None
-            })
+        # Get quizzes with grouped question counts, the user's latest attempt
+        # (window function) and attempt summary in a single statement
+        question_counts = db.session.query(
+            Question.quiz_id, func.count(Question.id).label("question_count")
+        ).join(Quiz, Quiz.id == Question.quiz_id).filter(
+            Quiz.module_id == module_id
+        ).group_by(Question.quiz_id).subquery()
+        ranked_attempts = db.session.query(
+            UserQuizAttempt.quiz_id,
+            UserQuizAttempt.id.label("attempt_id"),
+            UserQuizAttempt.score,
+            UserQuizAttempt.passed,
+            UserQuizAttempt.completed_at,
+            func.row_number().over(
+                partition_by=UserQuizAttempt.quiz_id, order_by=UserQuizAttempt.id.desc()
+            ).label("row_number")
+        ).join(Quiz, Quiz.id == UserQuizAttempt.quiz_id).filter(
+            Quiz.module_id == module_id,
+            UserQuizAttempt.user_id == user_id,
+            UserQuizAttempt.completed_at.isnot(None)
+        ).subquery()
+        latest = db.session.query(ranked_attempts).filter(ranked_attempts.c.row_number == 1).subquery()
+        
+        quiz_rows = db.session.query(
+            Quiz.id,
+            Quiz.title,
+            func.coalesce(question_counts.c.question_count, 0).label("question_count"),
+            latest.c.attempt_id,
+            latest.c.score,
+            latest.c.passed,
+            latest.c.completed_at,
+            UserQuizSummary.best_score,
+            UserQuizSummary.attempt_count,
+            UserQuizSummary.passed_at
+        ).outerjoin(
+            question_counts, question_counts.c.quiz_id == Quiz.id
+        ).outerjoin(
+            latest, latest.c.quiz_id == Quiz.id
+        ).outerjoin(
+            UserQuizSummary, and_(UserQuizSummary.quiz_id == Quiz.id, UserQuizSummary.user_id == user_id)
+        ).filter(Quiz.module_id == module_id).order_by(Quiz.id).all()
+        
+        quizzes_list = [{
+            "id": q.id,
+            "title": q.title,
+            "description": None,
+            "question_count": q.question_count,
+            "has_attempted": q.attempt_id is not None,
+            "last_score": q.score,
+            "last_attempt": {
+                "attempt_id": q.attempt_id,
+                "score": q.score,
+                "passed": q.passed,
+                "completed_at": q.completed_at.isoformat() if q.completed_at else None
+            } if q.attempt_id else None,
+            "best_score": q.best_score,
+            "attempt_count": q.attempt_count or 0,
+            "passed": q.passed_at is not None
+        } for q in quiz_rows]
         
         # Get progress
         progress = UserProgress.query.filter_by(user_id=user_id, module_id=module_id).first()
         
+        view_counter.record_module(module.id, path.id)
         return jsonify({
             "id": module.id,
             "title": module.title,
@@ -258,11 +447,15 @@ def update_module(module_id):
         data = request.get_json()
         module.title = data.get("title", module.title)
         module.description = data.get("description", module.description)
+        if isinstance(data.get("position"), int):
+            module.position = data["position"]
+        SearchService.index_module(module, path)
         db.session.commit()
 
         return jsonify({
             "message": "Module updated successfully",
-            "module": {"id": module.id, "title": module.title, "description": module.description}
+            "module": {"id": module.id, "title": module.title, "description": module.description,
+                       "position": module.position}
         }), 200
     except Exception as e:
         db.session.rollback()
@@ -280,8 +473,12 @@ def delete_module(module_id):
         if int(path.creator_id) != int(user_id) and user.role != "admin":
             return jsonify({"error": "Not authorized to delete this module"}), 403
 
+        PathProgressService.module_removed(path.id, module.id)
+        PathCounterService.adjust(path.id, module_count=-1)
+        SearchService.remove_module(module.id)
         db.session.delete(module)
         db.session.commit()
+        invalidate_catalogue()
         return jsonify({"message": "Module deleted successfully"}), 200
     except Exception as e:
         db.session.rollback()
@@ -325,6 +522,7 @@ def complete_module(module_id):
             return jsonify({"error": "You must follow the learning path first"}), 403
         
         progress = UserProgress.query.filter_by(user_id=user_id, module_id=module_id).first()
+        was_completed = progress is not None and progress.completion_percent == 100
         
         if not progress:
             progress = UserProgress(user_id=user_id, module_id=module_id, completion_percent=100)
@@ -332,7 +530,10 @@ def complete_module(module_id):
         else:
             progress.completion_percent = 100
         
+        path_progress = PathProgressService.module_progress_changed(user_id, path.id, was_completed, True)
         db.session.commit()
+        if not was_completed:
+            TrendingService.invalidate_pages()
         
         # Award points
         try:
@@ -340,18 +541,11 @@ def complete_module(module_id):
         except Exception as e:
             print(f"Failed to award points: {e}")
         
-        # Calculate path completion
-        all_modules = Module.query.filter_by(learning_path_id=path.id).all()
-        completed_count = sum(1 for m in all_modules 
-                            if UserProgress.query.filter_by(user_id=user_id, module_id=m.id, completion_percent=100).first())
-        
-        path_completion = int((completed_count / len(all_modules)) * 100) if all_modules else 0
-        
         return jsonify({
             "message": "Module marked as complete",
-            "path_completion_percentage": path_completion,
-            "completed_modules": completed_count,
-            "total_modules": len(all_modules)
+            "path_completion_percentage": path_progress.percent,
+            "completed_modules": path_progress.completed_modules,
+            "total_modules": path_progress.total_modules
         }), 200
     except Exception as e:
         db.session.rollback()
@@ -369,7 +563,11 @@ def follow_path(path_id):
             return jsonify({"message": "Already following this path"}), 200
 
         user.followed_paths.append(path)
+        PathCounterService.adjust(path.id, follower_count=1)
+        TrendingService.record(path.id, 'follow')
+        PathProgressService.rebuild(user.id, path.id)
         db.session.commit()
+        invalidate_catalogue()
         return jsonify({"message": "Successfully followed path", "path": {"id": path.id, "title": path.title}}), 200
     except Exception as e:
         db.session.rollback()
@@ -387,7 +585,9 @@ def unfollow_path(path_id):
             return jsonify({"error": "Not following this path"}), 400
 
         user.followed_paths.remove(path)
+        PathCounterService.adjust(path.id, follower_count=-1)
         db.session.commit()
+        invalidate_catalogue()
         return jsonify({"message": "Unfollowed learning path", "path": {"id": path.id, "title": path.title}}), 200
     except Exception as e:
         db.session.rollback()
@@ -399,25 +599,50 @@ def unfollow_path(path_id):
 def get_my_learning_paths():
     try:
         user, user_id = get_current_user()
-        followed_paths = []
-
-        for path in user.followed_paths:
-            if path.is_published:
-                completed = sum(1 for m in path.modules 
-                              if UserProgress.query.filter_by(user_id=user_id, module_id=m.id, completion_percent=100).first())
-                total = len(path.modules)
-                
-                followed_paths.append({
-                    "id": path.id,
-                    "title": path.title,
-                    "description": path.description,
-                    "completion_percentage": int((completed / total) * 100) if total > 0 else 0
-                })
+
+        rows = db.session.query(
+            LearningPath.id, LearningPath.title, LearningPath.description, UserPathProgress.percent
+        ).join(
+            path_followers, and_(path_followers.c.path_id == LearningPath.id, path_followers.c.user_id == user_id)
+        ).outerjoin(
+            UserPathProgress, and_(UserPathProgress.path_id == LearningPath.id, UserPathProgress.user_id == user_id)
+        ).filter(LearningPath.is_published.is_(True)).all()
+
+        followed_paths = [{
+            "id": path_id,
+            "title": title,
+            "description": description,
+            "completion_percentage": percent or 0
+        } for path_id, title, description, percent in rows]
 
         return jsonify(followed_paths), 200
     except Exception as e:
         return jsonify({"error": f"Failed to retrieve followed paths: {str(e)}"}), 500
 
+# GET Recommended Paths ("learners also followed")
+@learning_paths_bp.route("/recommendations", methods=["GET"])
+@jwt_required()
+def get_recommended_paths():
+    try:
+        _, user_id = get_current_user()
+        path_id = request.args.get("path_id", type=int)
+        limit = min(max(request.args.get("limit", 10, type=int), 1), 50)
+
+        if path_id:
+            rows = RecommendationService.for_path(path_id, limit)
+        else:
+            rows = RecommendationService.for_user(int(user_id), limit)
+
+        return jsonify([{
+            "id": rec_id,
+            "title": title,
+            "description": description,
+            "follower_count": follower_count,
+            "score": round(score, 4)
+        } for rec_id, title, description, follower_count, score in rows]), 200
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch recommendations: {str(e)}"}), 500
+
 # Update Learning Path
 @learning_paths_bp.route('/paths/<int:path_id>', methods=['PUT'])
 @jwt_required()
@@ -441,7 +666,9 @@ def update_learning_path(path_id):
         path.title = title
         path.description = description
         path.updated_at = datetime.utcnow()
+        SearchService.index_path(path)
         db.session.commit()
+        invalidate_catalogue()
 
         return jsonify({
             "message": "Learning path updated successfully",
@@ -463,8 +690,10 @@ def delete_learning_path(path_id):
         if int(path.creator_id) != int(user_id) and user.role != "admin":
             return jsonify({"error": "Not authorized to delete this path"}), 403
 
+        SearchService.remove_group("learning", path.id)
         db.session.delete(path)
         db.session.commit()
+        invalidate_catalogue()
         return jsonify({"message": "Learning path deleted successfully"}), 200
     except Exception as e:
         db.session.rollback()
@@ -508,7 +737,9 @@ def review_learning_path(path_id):
         else:
             return jsonify({"error": "Invalid action. Use 'approve' or 'reject'"}), 400
 
+        SearchService.set_group_visibility("learning", path.id, path.is_published)
         db.session.commit()
+        invalidate_catalogue()
         return jsonify({
             "message": f"Learning path {action}d successfully",
             "path": {"id": path.id, "title": path.title, "status": path.status.value, "is_published": path.is_published}
@@ -532,7 +763,7 @@ def get_pending_paths():
             "title": p.title,
             "description": p.description,
             "creator": p.creator.username if p.creator else "Unknown",
-            "module_count": p.modules.count(),
+            "module_count": p.module_count,
             "created_at": p.created_at.isoformat()
         } for p in pending.items],
         "page": page,
@@ -546,18 +777,17 @@ def get_pending_paths():
 def get_contributor_stats():
     try:
         user, user_id = get_current_user()
-        paths = LearningPath.query.filter_by(creator_id=user_id).all()
-        
-        total_paths = len(paths)
-        approved_paths = sum(1 for p in paths if p.status == ContentStatusEnum.approved)
-        total_views = sum(getattr(p, "views", 0) for p in paths)
+        total_paths, approved_paths, total_views = db.session.query(
+            func.count(LearningPath.id),
+            func.coalesce(func.sum(case((LearningPath.status == ContentStatusEnum.approved, 1), else_=0)), 0),
+            func.coalesce(func.sum(LearningPath.view_count), 0)
+        ).filter(LearningPath.creator_id == user_id).one()
         
         xp = getattr(user, "xp", 0)
         level = xp // 1000 + 1
         
-        # Calculate avg rating
-        ratings = [p.rating for p in paths if hasattr(p, "rating") and p.rating is not None]
-        avg_rating = round(sum(ratings) / len(ratings), 1) if ratings else 0
+        # Paths can't be rated yet, so there is no rating to average
+        avg_rating = 0
 
         return jsonify({
             "xp": xp,
@@ -1,9 +1,13 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from sqlalchemy import func
-from models import db, ContentFlag, CommunityPost, CommunityComment, User, ContentStatusEnum
+from sqlalchemy import func, and_
+from sqlalchemy.orm import aliased
+from models import db, ContentFlag, ReviewItem, CommunityPost, CommunityComment, User, ContentStatusEnum
 from utils.role_required import role_required
+from services.community_service import CommunityService
+from services.moderation_service import ReviewQueueService
+from utils.constants import CONTENT_PREVIEW_CONFIG
 
 moderation_bp = Blueprint('moderation_bp', __name__)
 
@@ -13,7 +17,7 @@ moderation_bp = Blueprint('moderation_bp', __name__)
 def flag_content():
     try:
         current_user = get_jwt_identity()
-        user_id = current_user["id"]
+        user_id = current_user["id"] if isinstance(current_user, dict) else int(current_user)
         
         data = request.get_json()
         post_id = data.get("post_id")
@@ -26,24 +30,26 @@ def flag_content():
         if not post_id and not comment_id:
             return jsonify({"error": "Either post_id or comment_id is required"}), 400
         
-        # Check if content exists
+        # Check if content exists; hidden posts were already actioned and
+        # must not send their review item back to the queue
         if post_id:
             post = CommunityPost.query.get(post_id)
-            if not post:
+            if not post or post.is_hidden:
                 return jsonify({"error": "Post not found"}), 404
         if comment_id:
             comment = CommunityComment.query.get(comment_id)
-            if not comment:
+            if not comment or (comment.post and comment.post.is_hidden):
                 return jsonify({"error": "Comment not found"}), 404
         
-        # Check if user already flagged this content
-        existing_flag = ContentFlag.query.filter_by(
+        # Check if user already flagged this content; once their earlier
+        # reports have been reviewed they may report it again
+        previous = [status for (status,) in db.session.query(ContentFlag.status).filter_by(
             reporter_id=user_id,
             post_id=post_id,
             comment_id=comment_id
-        ).first()
+        )]
         
-        if existing_flag:
+        if ContentStatusEnum.pending in previous:
             return jsonify({"error": "You have already flagged this content"}), 400
         
         # Create flag
@@ -56,11 +62,13 @@ def flag_content():
         )
         
         db.session.add(flag)
+        item = ReviewQueueService.record_report(flag, is_new_reporter=not previous)
         db.session.commit()
         
         return jsonify({
             "message": "Content flagged successfully for review",
-            "flag_id": flag.id
+            "flag_id": flag.id,
+            "review_item_id": item.id
         }), 201
     except Exception as e:
         db.session.rollback()
@@ -76,8 +84,45 @@ def get_flagged_content():
         per_page = request.args.get('per_page', 20, type=int)
         status_filter = request.args.get('status', 'pending')  # pending, reviewed, all
         
-        query = ContentFlag.query
+        # One joined row per flag with just the columns the queue shows;
+        # bodies arrive as SQL-side previews.
+        preview_chars = CONTENT_PREVIEW_CONFIG['moderation_chars']
+        reporter = aliased(User)
+        post_author = aliased(User)
+        comment_author = aliased(User)
+        comment_post = aliased(CommunityPost)
+        
+        query = db.session.query(
+            ContentFlag.id,
+            ContentFlag.reason,
+            ContentFlag.admin_notes,
+            ContentFlag.status,
+            ContentFlag.created_at,
+            ContentFlag.post_id,
+            reporter.username.label("reporter_username"),
+            CommunityPost.id.label("found_post_id"),
+            CommunityPost.title.label("post_title"),
+            *CommunityService.preview_columns(CommunityPost.content, preview_chars, "post_preview"),
+            post_author.username.label("post_author"),
+            CommunityComment.id.label("found_comment_id"),
+            *CommunityService.preview_columns(CommunityComment.content, preview_chars, "comment_preview"),
+            comment_author.username.label("comment_author"),
+            comment_post.title.label("comment_post_title")
+        ).outerjoin(
+            reporter, reporter.id == ContentFlag.reporter_id
+        ).outerjoin(
+            CommunityPost, CommunityPost.id == ContentFlag.post_id
+        ).outerjoin(
+            post_author, post_author.id == CommunityPost.author_id
+        ).outerjoin(
+            CommunityComment, CommunityComment.id == ContentFlag.comment_id
+        ).outerjoin(
+            comment_author, comment_author.id == CommunityComment.author_id
+        ).outerjoin(
+            comment_post, comment_post.id == CommunityComment.post_id
+        )
         
+        # Both filters read ix_content_flag_status_created in queue order
         if status_filter == 'pending':
             query = query.filter(ContentFlag.status == ContentStatusEnum.pending)
         elif status_filter == 'reviewed':
@@ -88,29 +133,30 @@ def get_flagged_content():
         )
         
         content_data = []
-        for flag in flagged_content.items:
+        for row in flagged_content.items:
             flag_data = {
-                "flag_id": flag.id,
-                "reporter_username": flag.reporter.username,
-                "reason": flag.reason,
-                "status": flag.status.value,
-                "created_at": flag.created_at.isoformat(),
-                "content_type": "post" if flag.post_id else "comment"
+                "flag_id": row.id,
+                "reporter_username": row.reporter_username,
+                "reason": row.reason,
+                "admin_notes": row.admin_notes,
+                "status": row.status.value,
+                "created_at": row.created_at.isoformat(),
+                "content_type": "post" if row.post_id else "comment"
             }
             
-            if flag.post:
+            if row.found_post_id:
                 flag_data.update({
-                    "content_id": flag.post.id,
-                    "content_title": flag.post.title,
-                    "content_preview": flag.post.content[:100] + "..." if len(flag.post.content) > 100 else flag.post.content,
-                    "author_username": flag.post.author.username
+                    "content_id": row.found_post_id,
+                    "content_title": row.post_title,
+                    "content_preview": CommunityService.format_preview(row.post_preview, row.post_preview_truncated),
+                    "author_username": row.post_author
                 })
-            elif flag.comment:
+            elif row.found_comment_id:
                 flag_data.update({
-                    "content_id": flag.comment.id,
-                    "content_preview": flag.comment.content[:100] + "..." if len(flag.comment.content) > 100 else flag.comment.content,
-                    "author_username": flag.comment.author.username,
-                    "post_title": flag.comment.post.title if flag.comment.post else "Unknown Post"
+                    "content_id": row.found_comment_id,
+                    "content_preview": CommunityService.format_preview(row.comment_preview, row.comment_preview_truncated),
+                    "author_username": row.comment_author,
+                    "post_title": row.comment_post_title or "Unknown Post"
                 })
             
             content_data.append(flag_data)
@@ -124,6 +170,114 @@ def get_flagged_content():
     except Exception as e:
         return jsonify({"error": f"Failed to load flagged content: {str(e)}"}), 500
 
+# ADMIN: Review queue, one item per reported post or comment
+@moderation_bp.route('/admin/review-queue', methods=['GET'])
+@jwt_required()
+@role_required("admin")
+def get_review_queue():
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = min(request.args.get('per_page', 20, type=int), 100)
+        status_filter = request.args.get('status', 'pending')  # pending, approved, rejected
+        
+        if status_filter not in [s.value for s in ContentStatusEnum]:
+            return jsonify({"error": "Invalid status"}), 400
+        
+        preview_chars = CONTENT_PREVIEW_CONFIG['moderation_chars']
+        post_author = aliased(User)
+        comment_author = aliased(User)
+        comment_post = aliased(CommunityPost)
+        
+        query = db.session.query(
+            ReviewItem,
+            CommunityPost.title.label("post_title"),
+            *CommunityService.preview_columns(CommunityPost.content, preview_chars, "post_preview"),
+            post_author.username.label("post_author"),
+            *CommunityService.preview_columns(CommunityComment.content, preview_chars, "comment_preview"),
+            comment_author.username.label("comment_author"),
+            comment_post.id.label("comment_post_id"),
+            comment_post.title.label("comment_post_title")
+        ).outerjoin(
+            CommunityPost, and_(ReviewItem.content_type == "post", CommunityPost.id == ReviewItem.content_id)
+        ).outerjoin(
+            post_author, post_author.id == CommunityPost.author_id
+        ).outerjoin(
+            CommunityComment, and_(ReviewItem.content_type == "comment", CommunityComment.id == ReviewItem.content_id)
+        ).outerjoin(
+            comment_author, comment_author.id == CommunityComment.author_id
+        ).outerjoin(
+            comment_post, comment_post.id == CommunityComment.post_id
+        ).filter(
+            ReviewItem.status == ContentStatusEnum(status_filter)
+        )
+        
+        # Served straight from ix_review_item_status_priority
+        items = query.order_by(ReviewItem.priority.desc(), ReviewItem.id.desc()).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        
+        queue = []
+        for row in items.items:
+            item_data = row.ReviewItem.to_dict()
+            if row.ReviewItem.content_type == "post":
+                item_data.update({
+                    "content_title": row.post_title,
+                    "content_preview": CommunityService.format_preview(row.post_preview, row.post_preview_truncated),
+                    "author_username": row.post_author
+                })
+            else:
+                item_data.update({
+                    "content_preview": CommunityService.format_preview(row.comment_preview, row.comment_preview_truncated),
+                    "author_username": row.comment_author,
+                    "post_id": row.comment_post_id,
+                    "post_title": row.comment_post_title
+                })
+            queue.append(item_data)
+        
+        return jsonify({
+            "review_items": queue,
+            "page": page,
+            "total_pages": items.pages,
+            "total_items": items.total
+        }), 200
+    except Exception as e:
+        return jsonify({"error": f"Failed to load review queue: {str(e)}"}), 500
+
+# ADMIN: Resolve a review item and every pending flag on it
+@moderation_bp.route('/admin/review-items/<int:item_id>/resolve', methods=['PUT'])
+@jwt_required()
+@role_required("admin")
+def resolve_review_item(item_id):
+    try:
+        current_user = get_jwt_identity()
+        admin_id = current_user["id"] if isinstance(current_user, dict) else int(current_user)
+        
+        item = ReviewItem.query.get_or_404(item_id)
+        data = request.get_json()
+        
+        action = data.get("action")  # "approve" or "reject"
+        admin_notes = data.get("admin_notes", "").strip()
+        
+        if action not in ["approve", "reject"]:
+            return jsonify({"error": "Action must be 'approve' or 'reject'"}), 400
+        
+        if item.status != ContentStatusEnum.pending:
+            return jsonify({"error": "Review item is already resolved"}), 400
+        
+        closed = ReviewQueueService.resolve(item, action, admin_id, admin_notes)
+        db.session.commit()
+        if action == "approve":
+            CommunityService.invalidate_feed()
+        
+        return jsonify({
+            "message": "Content action taken" if action == "approve" else "Reports dismissed - content remains published",
+            "review_item": item.to_dict(),
+            "flags_closed": closed
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Failed to resolve review item: {str(e)}"}), 500
+
 # ADMIN: Resolve flag
 @moderation_bp.route('/admin/flags/<int:flag_id>/resolve', methods=['PUT'])
 @jwt_required()
@@ -131,7 +285,7 @@ def get_flagged_content():
 def resolve_flag(flag_id):
     try:
         current_user = get_jwt_identity()
-        admin_id = current_user["id"]
+        admin_id = current_user["id"] if isinstance(current_user, dict) else int(current_user)
         
         flag = ContentFlag.query.get_or_404(flag_id)
         data = request.get_json()
@@ -142,15 +296,14 @@ def resolve_flag(flag_id):
         if action not in ["approve", "reject"]:
             return jsonify({"error": "Action must be 'approve' or 'reject'"}), 400
         
+        content_type = "post" if flag.post_id else "comment"
         if action == "approve":
             flag.status = ContentStatusEnum.approved
-            # Take action on the content (remove/hide it)
-            if flag.post:
-                # For posts, you might want to hide or remove them
-                flag.post.status = ContentStatusEnum.rejected
-            elif flag.comment:
-                # For comments, remove them
-                db.session.delete(flag.comment)
+            # Take action on the content: posts are hidden, comments removed
+            if flag.post_id:
+                CommunityService.hide_posts([flag.post_id])
+            elif flag.comment_id:
+                CommunityService.delete_comments([flag.comment_id])
             
             message = "Flag approved and content action taken"
         else:
@@ -159,15 +312,19 @@ def resolve_flag(flag_id):
         
         # Add admin notes if provided
         if admin_notes:
-            flag.reason += f" | Admin Notes: {admin_notes}"
+            flag.admin_notes = admin_notes
         
+        db.session.flush()
+        ReviewQueueService.settle_items([flag.id], flag.status, admin_id)
         db.session.commit()
+        if action == "approve":
+            CommunityService.invalidate_feed()
         
         return jsonify({
             "message": message,
             "flag_id": flag.id,
             "action_taken": action,
-            "content_type": "post" if flag.post else "comment"
+            "content_type": content_type
         }), 200
     except Exception as e:
         db.session.rollback()
@@ -229,6 +386,7 @@ def get_moderation_stats():
 def bulk_action_flags():
     try:
         current_user = get_jwt_identity()
+        admin_id = current_user["id"] if isinstance(current_user, dict) else int(current_user)
         data = request.get_json()
         
         flag_ids = data.get("flag_ids", [])
@@ -241,25 +399,28 @@ def bulk_action_flags():
         if action not in ["approve", "reject"]:
             return jsonify({"error": "Action must be 'approve' or 'reject'"}), 400
         
-        flags = ContentFlag.query.filter(ContentFlag.id.in_(flag_ids)).all()
+        flags = ContentFlag.query.filter(ContentFlag.id.in_(flag_ids))
         
-        processed = 0
-        for flag in flags:
-            if action == "approve":
-                flag.status = ContentStatusEnum.approved
-                if flag.post:
-                    flag.post.status = ContentStatusEnum.rejected
-                elif flag.comment:
-                    db.session.delete(flag.comment)
-            else:
-                flag.status = ContentStatusEnum.rejected
-            
-            if admin_notes:
-                flag.reason += f" | Bulk Action Notes: {admin_notes}"
-            
-            processed += 1
+        # The same handful of statements for 5 flags or 5,000: act on the
+        # content while the flags still point at it, then close the flags.
+        if action == "approve":
+            targets = flags.with_entities(ContentFlag.post_id, ContentFlag.comment_id).distinct().all()
+            CommunityService.hide_posts({post_id for post_id, _ in targets if post_id})
+            CommunityService.delete_comments(
+                list({comment_id for post_id, comment_id in targets if not post_id and comment_id})
+            )
+        
+        values = {
+            ContentFlag.status: ContentStatusEnum.approved if action == "approve" else ContentStatusEnum.rejected
+        }
+        if admin_notes:
+            values[ContentFlag.admin_notes] = admin_notes
+        processed = flags.update(values, synchronize_session=False)
+        ReviewQueueService.settle_items(flag_ids, values[ContentFlag.status], admin_id)
         
         db.session.commit()
+        if action == "approve":
+            CommunityService.invalidate_feed()
         
         return jsonify({
             "message": f"Processed {processed} flags with action: {action}",
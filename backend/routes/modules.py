@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 from models import db, Module, LearningResource
 from utils.role_required import role_required
+from services.search_service import SearchService
 
 modules_bp = Blueprint("modules_bp", __name__)
 
@@ -48,6 +49,7 @@ def create_resource(module_id):
         module_id=module_id
     )
     db.session.add(new_resource)
+    SearchService.index_resource(new_resource, module)
     db.session.commit()
 
     return jsonify(new_resource.to_dict()), 201
@@ -1,8 +1,8 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from models import db, User, Module, UserProgress, LearningPath
-from services.core_services import PointsService
+from models import db, User, Module, UserProgress, UserPathProgress, LearningPath
+from services.core_services import PointsService, PathProgressService
 from flask_cors import cross_origin  # ✅ Add this import
 
 progress_bp = Blueprint('progress_bp', __name__)
@@ -14,12 +14,13 @@ def complete_module(module_id):
     try:
         current_user = get_jwt_identity()
         module = Module.query.get_or_404(module_id)
-        user = User.query.get(current_user["id"])
+        user = User.query.get(current_user["id"] if isinstance(current_user, dict) else current_user)
 
         if module.learning_path not in user.followed_paths:
             return jsonify({"error": "You must follow the path"}), 400
 
         progress = UserProgress.query.filter_by(user_id=user.id, module_id=module_id).first()
+        was_completed = progress is not None and progress.completion_percent == 100
         if not progress:
             progress = UserProgress(user_id=user.id, module_id=module_id, completion_percent=100, completed_at=datetime.utcnow())
             db.session.add(progress)
@@ -27,11 +28,13 @@ def complete_module(module_id):
             progress.completion_percent = 100
             progress.completed_at = datetime.utcnow()
 
+        path_progress = PathProgressService.module_progress_changed(user.id, module.learning_path_id, was_completed, True)
         db.session.commit()
         PointsService.award_points(user, 'complete_module')
         return jsonify({
             "message": "Module completed",
-            "progress": {"module_id": module.id, "completion_percent": 100}
+            "progress": {"module_id": module.id, "completion_percent": 100},
+            "path_progress": path_progress.to_dict() if path_progress else None
         }), 200
     except Exception:
         db.session.rollback()
@@ -42,26 +45,29 @@ def complete_module(module_id):
 @jwt_required()
 def get_path_progress(path_id):
     current_user = get_jwt_identity()
+    user_id = current_user["id"] if isinstance(current_user, dict) else current_user
     path = LearningPath.query.get_or_404(path_id)
-    total_completion = 0
-    progress_data = []
-
-    for m in path.modules:
-        user_progress = UserProgress.query.filter_by(user_id=current_user["id"], module_id=m.id).first()
-        completion = user_progress.completion_percent if user_progress else 0
-        total_completion += completion
-        progress_data.append({
-            "module_id": m.id,
-            "module_title": m.title,
-            "completion_percent": completion,
-            "completed_at": user_progress.completed_at.isoformat() if user_progress and user_progress.completed_at else None
-        })
-
-    overall = total_completion / len(path.modules) if path.modules.count() > 0 else 0
+
+    rows = db.session.query(
+        Module.id, Module.title, UserProgress.completion_percent, UserProgress.completed_at
+    ).outerjoin(
+        UserProgress, (UserProgress.module_id == Module.id) & (UserProgress.user_id == user_id)
+    ).filter(Module.learning_path_id == path_id).order_by(Module.position, Module.id).all()
+
+    progress_data = [{
+        "module_id": module_id,
+        "module_title": title,
+        "completion_percent": completion or 0,
+        "completed_at": completed_at.isoformat() if completed_at else None
+    } for module_id, title, completion, completed_at in rows]
+
+    path_progress = UserPathProgress.query.filter_by(user_id=user_id, path_id=path_id).first()
     return jsonify({
         "path_id": path.id,
         "path_title": path.title,
-        "overall_completion": round(overall, 2),
+        "overall_completion": path_progress.percent if path_progress else 0,
+        "completed_modules": path_progress.completed_modules if path_progress else 0,
+        "completed_at": path_progress.completed_at.isoformat() if path_progress and path_progress.completed_at else None,
         "progress": progress_data
     }), 200
 
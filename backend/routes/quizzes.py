@@ -3,10 +3,13 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from models import (
     db, Quiz, Question, Choice, UserQuizAttempt, UserQuizAnswer, 
-    User, UserChallenge, UserProgress, ChallengeParticipation
+    User, UserChallenge, UserProgress, ChallengeParticipation, Module, UserQuizSummary
 )
 from utils.role_required import role_required
-from services.core_services import PointsService, BadgeService
+from services.core_services import PointsService, BadgeService, PathProgressService, TrendingService
+from services.quiz_services import QuizService, QuizImportService
+from services.session_store import quiz_sessions
+from utils.constants import QUIZ_SESSION_CONFIG
 
 quizzes_bp = Blueprint("quizzes_bp", __name__)
 
@@ -19,23 +22,29 @@ def get_quizzes(module_id):
 
 
 # GET a specific quiz (with questions)
+# Read-only: sampled and timed quizzes hand out their questions from
+# POST .../start, which records them on the attempt and starts the clock.
 @quizzes_bp.route("/<int:module_id>/quizzes/<int:quiz_id>", methods=["GET"])
 @jwt_required()
 def get_quiz(module_id, quiz_id):
     quiz = Quiz.query.filter_by(id=quiz_id, module_id=module_id).first_or_404()
-    questions_data = [
-        {
-            "id": q.id,
-            "text": q.text,
-            "choices": [c.to_public_dict() for c in q.choices]
-        } for q in quiz.questions
-    ]
-    return jsonify({
+
+    response = {
         "id": quiz.id,
         "title": quiz.title,
         "module_id": quiz.module_id,
-        "questions": questions_data
-    }), 200
+        "draw_count": quiz.draw_count,
+        "requires_start": bool(quiz.draw_count or quiz.time_limit_seconds)
+    }
+    if response["requires_start"]:
+        response["questions"] = []
+    else:
+        # A missing bank is read for this response only; start and submit store it
+        question_ids = quiz.question_ids
+        if question_ids is None:
+            question_ids = QuizService.bank_question_ids(quiz.id)
+        response["questions"] = QuizService.load_questions(question_ids)
+    return jsonify(response), 200
 
 
 # CREATE a quiz under a module
@@ -46,16 +55,50 @@ def create_quiz(module_id):
     data = request.get_json()
     title = data.get("title")
     passing_score = data.get("passing_score", 70)
+    draw_count = data.get("draw_count")
+    time_limit_seconds = data.get("time_limit_seconds")
     
     if not title:
         return jsonify({"error": "Quiz title is required"}), 400
+    if draw_count is not None and (not isinstance(draw_count, int) or draw_count < 1):
+        return jsonify({"error": "draw_count must be a positive integer"}), 400
+    if time_limit_seconds is not None and (not isinstance(time_limit_seconds, int) or time_limit_seconds < 1):
+        return jsonify({"error": "time_limit_seconds must be a positive integer"}), 400
     
-    new_quiz = Quiz(title=title, module_id=module_id, passing_score=passing_score)
+    new_quiz = Quiz(title=title, module_id=module_id, passing_score=passing_score,
+                    draw_count=draw_count, time_limit_seconds=time_limit_seconds, question_ids=[])
     db.session.add(new_quiz)
     db.session.commit()
     return jsonify(new_quiz.to_dict()), 201
 
 
+# UPDATE quiz settings (title, passing score, questions drawn per attempt)
+@quizzes_bp.route("/<int:module_id>/quizzes/<int:quiz_id>", methods=["PUT"])
+@jwt_required()
+@role_required("admin", "contributor")
+def update_quiz(module_id, quiz_id):
+    quiz = Quiz.query.filter_by(id=quiz_id, module_id=module_id).first_or_404()
+    data = request.get_json() or {}
+
+    if "draw_count" in data:
+        draw_count = data["draw_count"]
+        if draw_count is not None and (not isinstance(draw_count, int) or draw_count < 1):
+            return jsonify({"error": "draw_count must be a positive integer"}), 400
+        quiz.draw_count = draw_count
+
+    if "time_limit_seconds" in data:
+        time_limit_seconds = data["time_limit_seconds"]
+        if time_limit_seconds is not None and (not isinstance(time_limit_seconds, int) or time_limit_seconds < 1):
+            return jsonify({"error": "time_limit_seconds must be a positive integer"}), 400
+        quiz.time_limit_seconds = time_limit_seconds
+
+    quiz.title = data.get("title", quiz.title)
+    quiz.passing_score = data.get("passing_score", quiz.passing_score)
+    quiz.cache_version = Quiz.cache_version + 1
+    db.session.commit()
+    return jsonify(quiz.to_dict()), 200
+
+
 # ADD a question to a quiz
 @quizzes_bp.route("/<int:module_id>/quizzes/<int:quiz_id>/questions", methods=["POST"])
 @jwt_required()
@@ -81,11 +124,120 @@ def add_question(module_id, quiz_id):
             question_id=question.id
         )
         db.session.add(choice)
+    QuizService.refresh_question_bank(quiz)
     db.session.commit()
     
     return jsonify(question.to_dict()), 201
 
 
+def _read_import_payload():
+    """Return (metadata, questions) from an uploaded file, a CSV body or a JSON body."""
+    upload = request.files.get("file")
+    if upload:
+        fmt = "json" if (upload.filename or "").lower().endswith(".json") else "csv"
+        metadata, questions = QuizImportService.parse(upload.read().decode("utf-8-sig"), fmt)
+        return {**request.form.to_dict(), **metadata}, questions
+    if request.mimetype == "text/csv":
+        return request.args.to_dict(), QuizImportService.parse_csv(request.get_data(as_text=True))
+    data = request.get_json(silent=True)
+    return data or {}, QuizImportService.parse_document(data)
+
+
+# BULK IMPORT a whole quiz (JSON document or CSV) under a module
+@quizzes_bp.route("/<int:module_id>/quizzes/import", methods=["POST"])
+@jwt_required()
+@role_required("admin", "contributor")
+def import_quiz(module_id):
+    Module.query.get_or_404(module_id)
+    try:
+        metadata, questions = _read_import_payload()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        passing_score = int(metadata.get("passing_score", 70))
+        draw_count = int(metadata["draw_count"]) if metadata.get("draw_count") not in (None, "") else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "passing_score and draw_count must be integers"}), 400
+
+    title = (metadata.get("title") or "").strip()
+    if not title:
+        return jsonify({"error": "Quiz title is required"}), 400
+
+    if draw_count is not None and not 1 <= draw_count <= len(questions):
+        return jsonify({"error": f"draw_count must be between 1 and the number of questions ({len(questions)})"}), 400
+
+    quiz = Quiz(title=title, module_id=module_id, passing_score=passing_score, draw_count=draw_count)
+    try:
+        question_ids = QuizImportService.import_questions(quiz, questions)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Failed to import quiz: {str(e)}"}), 500
+
+    return jsonify({
+        "message": "Quiz imported successfully",
+        "quiz": quiz.to_dict(),
+        "imported_questions": len(question_ids)
+    }), 201
+
+
+# BULK IMPORT questions into an existing quiz
+@quizzes_bp.route("/<int:module_id>/quizzes/<int:quiz_id>/questions/import", methods=["POST"])
+@jwt_required()
+@role_required("admin", "contributor")
+def import_questions(module_id, quiz_id):
+    quiz = Quiz.query.filter_by(id=quiz_id, module_id=module_id).first_or_404()
+    try:
+        _, questions = _read_import_payload()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        question_ids = QuizImportService.import_questions(quiz, questions)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Failed to import questions: {str(e)}"}), 500
+
+    return jsonify({
+        "message": "Questions imported successfully",
+        "quiz_id": quiz.id,
+        "imported_questions": len(question_ids)
+    }), 201
+
+
+# START a quiz attempt: issues a session token with a server-side deadline
+@quizzes_bp.route("/<int:module_id>/quizzes/<int:quiz_id>/start", methods=["POST"])
+@jwt_required()
+def start_quiz(module_id, quiz_id):
+    current_user = get_jwt_identity()
+    user_id = int(current_user["id"] if isinstance(current_user, dict) else current_user)
+    
+    quiz = Quiz.query.filter_by(id=quiz_id, module_id=module_id).first_or_404()
+    question_ids = QuizService.draw_questions(quiz)
+    if not question_ids:
+        return jsonify({"error": "This quiz has no questions yet"}), 400
+    
+    attempt = UserQuizAttempt(
+        user_id=user_id,
+        quiz_id=quiz.id,
+        drawn_question_ids=question_ids,
+        started_at=datetime.utcnow()
+    )
+    db.session.add(attempt)
+    db.session.commit()
+    
+    ttl = quiz.time_limit_seconds or QUIZ_SESSION_CONFIG['default_ttl_seconds']
+    token = quiz_sessions.create(user_id, quiz.id, attempt.id, ttl, question_ids)
+    
+    return jsonify({
+        "session_token": token,
+        "attempt_id": attempt.id,
+        "time_limit_seconds": quiz.time_limit_seconds,
+        "started_at": attempt.started_at.isoformat(),
+        "expires_in": ttl,
+        "questions": QuizService.load_questions(question_ids)
+    }), 201
+
+
 # SUBMIT quiz attempt - FIXED VERSION
 @quizzes_bp.route("/<int:module_id>/quizzes/<int:quiz_id>/attempt", methods=["POST"])
 @jwt_required()
@@ -102,42 +254,66 @@ def submit_quiz(module_id, quiz_id):
     quiz = Quiz.query.filter_by(id=quiz_id, module_id=module_id).first_or_404()
     user = User.query.get(user_id)
     
-    # Create quiz attempt
-    attempt = UserQuizAttempt(user_id=user_id, quiz_id=quiz_id, started_at=datetime.utcnow())
-    db.session.add(attempt)
+    session_token = data.get("session_token")
+    attempt_id = data.get("attempt_id")
+    if session_token:
+        # Started attempt: validated against the session store, no table reads
+        session = quiz_sessions.get(session_token)
+        if (not session or session.user_id != int(user_id) or session.quiz_id != quiz_id
+                or not quiz_sessions.consume(session_token)):
+            return jsonify({"error": "Quiz session is invalid or has already been used"}), 400
+        if session.is_expired(grace=QUIZ_SESSION_CONFIG['grace_seconds']):
+            return jsonify({"error": "Time limit exceeded for this attempt"}), 400
+        attempt = db.session.get(UserQuizAttempt, session.attempt_id)
+        question_ids = list(session.question_ids)
+    elif quiz.time_limit_seconds:
+        return jsonify({"error": "This quiz is timed; start an attempt first"}), 400
+    elif attempt_id:
+        # Started attempt: grade against the questions it was handed
+        attempt = UserQuizAttempt.query.filter_by(
+            id=attempt_id, user_id=user_id, quiz_id=quiz_id, completed_at=None
+        ).first()
+        if not attempt:
+            return jsonify({"error": "Attempt not found or already submitted"}), 400
+        question_ids = attempt.drawn_question_ids
+        if question_ids is None:
+            question_ids = QuizService.question_bank(quiz)
+    elif quiz.draw_count:
+        return jsonify({"error": "This quiz draws questions per attempt; start an attempt first"}), 400
+    else:
+        attempt = UserQuizAttempt(user_id=user_id, quiz_id=quiz_id, started_at=datetime.utcnow())
+        db.session.add(attempt)
+        question_ids = QuizService.question_bank(quiz)
+    if not question_ids:
+        db.session.rollback()
+        return jsonify({"error": "This quiz has no questions to grade"}), 400
     db.session.flush()
     
     # Grade the quiz
-    correct_count = 0
-    for ans in answers:
-        question = Question.query.get(ans["question_id"])
-        choice = Choice.query.get(ans["choice_id"])
-        if not question or not choice:
-            continue
-        
-        is_correct = choice.is_correct
-        if is_correct:
-            correct_count += 1
-        
-        user_answer = UserQuizAnswer(
+    correct_count, graded = QuizService.grade_answers(question_ids, answers)
+    db.session.add_all([
+        UserQuizAnswer(
             attempt_id=attempt.id,
-            question_id=question.id,
-            choice_id=choice.id,
+            question_id=question_id,
+            choice_id=choice_id,
             is_correct=is_correct
-        )
-        db.session.add(user_answer)
+        ) for question_id, choice_id, is_correct in graded
+    ])
     
-    total_questions = quiz.questions.count()
+    total_questions = len(question_ids)
     score = int((correct_count / total_questions) * 100) if total_questions else 0
     passed = score >= quiz.passing_score
     
     attempt.score = score
     attempt.passed = passed
     attempt.completed_at = datetime.utcnow()
+    QuizService.record_attempt_summary(user_id, quiz_id, score, passed, attempt.completed_at)
     
     # Update module progress if quiz belongs to a module
+    completed_path_module = False
     if quiz.module:
         progress = UserProgress.query.filter_by(user_id=user_id, module_id=quiz.module.id).first()
+        was_completed = progress is not None and progress.completion_percent == 100
         if not progress:
             progress = UserProgress(user_id=user_id, module_id=quiz.module.id)
         
@@ -146,6 +322,8 @@ def submit_quiz(module_id, quiz_id):
         if passed:
             progress.completed_at = datetime.utcnow()
         db.session.add(progress)
+        PathProgressService.module_progress_changed(user_id, quiz.module.learning_path_id, was_completed, passed)
+        completed_path_module = passed and not was_completed and quiz.module.learning_path_id is not None
     
     # Check if this quiz is part of a challenge
     challenge = UserChallenge.query.filter_by(quiz_id=quiz_id).first()
@@ -178,6 +356,8 @@ def submit_quiz(module_id, quiz_id):
         db.session.add(participation)
     
     db.session.commit()
+    if completed_path_module:
+        TrendingService.invalidate_pages()
     
     
     if is_challenge_quiz:
@@ -210,7 +390,7 @@ def submit_quiz(module_id, quiz_id):
             )
         
         # Perfect score bonus
-        if correct_count == total_questions:
+        if total_questions and correct_count == total_questions:
             PointsService.award_points(
                 user, 
                 "quiz_perfect", 
@@ -228,14 +408,27 @@ def submit_quiz(module_id, quiz_id):
     }), 200
 
 
-# GET all attempts for a quiz
+# GET attempt history for a quiz (cursor-paginated, newest first)
 @quizzes_bp.route("/<int:module_id>/quizzes/<int:quiz_id>/attempts", methods=["GET"])
 @jwt_required()
 def get_quiz_attempts(module_id, quiz_id):
     current_user = get_jwt_identity()
     user_id = current_user["id"] if isinstance(current_user, dict) else current_user
+    cursor = request.args.get("cursor", type=int)
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
     
-    attempts = UserQuizAttempt.query.filter_by(user_id=user_id, quiz_id=quiz_id).all()
+    query = UserQuizAttempt.query.filter(
+        UserQuizAttempt.user_id == user_id,
+        UserQuizAttempt.quiz_id == quiz_id,
+        UserQuizAttempt.completed_at.isnot(None)
+    )
+    if cursor:
+        query = query.filter(UserQuizAttempt.id < cursor)
+    attempts = query.order_by(UserQuizAttempt.id.desc()).limit(limit + 1).all()
+    has_more = len(attempts) > limit
+    attempts = attempts[:limit]
+    
+    summary = UserQuizSummary.query.filter_by(user_id=user_id, quiz_id=quiz_id).first()
     data = [{
         "attempt_id": a.id,
         "score": a.score,
@@ -243,7 +436,24 @@ def get_quiz_attempts(module_id, quiz_id):
         "completed_at": a.completed_at.isoformat() if a.completed_at else None
     } for a in attempts]
     
-    return jsonify(data), 200
+    return jsonify({
+        "summary": summary.to_dict() if summary else None,
+        "attempts": data,
+        "next_cursor": attempts[-1].id if has_more else None
+    }), 200
+
+
+# GET per-quiz leaderboard (best score, then earliest to reach it)
+@quizzes_bp.route("/<int:module_id>/quizzes/<int:quiz_id>/leaderboard", methods=["GET"])
+@jwt_required()
+def get_quiz_leaderboard(module_id, quiz_id):
+    quiz = Quiz.query.filter_by(id=quiz_id, module_id=module_id).first_or_404()
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+    try:
+        page = QuizService.get_leaderboard_page(quiz, request.args.get("cursor"), limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"quiz_title": quiz.title, **page}), 200
 
 
 # Admin: Link a quiz to a challenge
@@ -0,0 +1,155 @@
+import math
+from datetime import datetime, timedelta
+from sqlalchemy import func, and_, or_, case, extract, literal, select, DateTime
+from models import db, CommunityPost, CommunityComment, ContentFlag
+from services.search_service import SearchService
+from utils.cache import shared_cache
+from utils.constants import HOT_FEED_CONFIG
+
+FEED_CACHE = "feed"
+
+
+class CommunityService:
+    """Bookkeeping and keyset paging for community posts and comments.
+
+    Each post carries a hot score: sum(exp(-rate * age)) over its comments,
+    stored as of hot_scored_at. A new comment decays the score to now and
+    adds one; the periodic `decay_hot_scores` job decays every active post in
+    one UPDATE so that quiet threads sink and the hot index stays small.
+    """
+
+    @staticmethod
+    def encode_cursor(created_at, row_id):
+        return f"{created_at.isoformat()}_{row_id}"
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            created_at, row_id = cursor.rsplit("_", 1)
+            return datetime.fromisoformat(created_at), int(row_id)
+        except (ValueError, AttributeError):
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def keyset_page(query, created_col, id_col, cursor, limit, newest_first=True):
+        """Apply (created_at, id) keyset paging; returns (rows, next_cursor).
+
+        Rows must expose `created_at` and `id`, e.g. by selecting the columns
+        under those names.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        if cursor:
+            created_at, row_id = CommunityService.decode_cursor(cursor)
+            if newest_first:
+                query = query.filter(or_(created_col < created_at, and_(created_col == created_at, id_col < row_id)))
+            else:
+                query = query.filter(or_(created_col > created_at, and_(created_col == created_at, id_col > row_id)))
+
+        order = (created_col.desc(), id_col.desc()) if newest_first else (created_col.asc(), id_col.asc())
+        rows = query.order_by(*order).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = CommunityService.encode_cursor(rows[-1].created_at, rows[-1].id)
+        return rows, next_cursor
+
+    @staticmethod
+    def preview_columns(column, length, name="preview"):
+        """The first `length` characters of a text column and whether it was cut, both computed in SQL."""
+        return (
+            func.substr(column, 1, length).label(name),
+            (func.length(column) > length).label(f"{name}_truncated")
+        )
+
+    @staticmethod
+    def format_preview(preview, truncated):
+        if preview is None:
+            return None
+        return preview + "..." if truncated else preview
+
+    @staticmethod
+    def invalidate_feed():
+        """Drop cached feed pages in every worker; call after committing."""
+        shared_cache.invalidate(FEED_CACHE)
+
+    @staticmethod
+    def _seconds_since(column, now):
+        """SQL expression for the seconds from `column` (NULL counts as now) to `now`."""
+        now = literal(now, DateTime)
+        column = func.coalesce(column, now)
+        if db.session.get_bind().dialect.name == "postgresql":
+            return extract("epoch", now - column)
+        return (func.julianday(now) - func.julianday(column)) * 86400.0
+
+    @staticmethod
+    def _decay(column, now):
+        rate = math.log(2) / (HOT_FEED_CONFIG['half_life_hours'] * 3600)
+        return func.exp(-rate * CommunityService._seconds_since(column, now))
+
+    @staticmethod
+    def comment_added(post_id, at=None):
+        now = at or datetime.utcnow()
+        CommunityPost.query.filter_by(id=post_id).update({
+            CommunityPost.comment_count: CommunityPost.comment_count + 1,
+            CommunityPost.hot_score: CommunityPost.hot_score * CommunityService._decay(CommunityPost.hot_scored_at, now) + 1,
+            CommunityPost.hot_scored_at: now
+        }, synchronize_session=False)
+
+    @staticmethod
+    def decay_hot_scores(now=None):
+        """Bring every active post's hot score forward to `now`; returns the number of posts touched."""
+        now = now or datetime.utcnow()
+        decayed = CommunityPost.hot_score * CommunityService._decay(CommunityPost.hot_scored_at, now)
+        return CommunityPost.query.filter(CommunityPost.hot_score > 0).update({
+            CommunityPost.hot_score: case((decayed < HOT_FEED_CONFIG['floor'], 0.0), else_=decayed),
+            CommunityPost.hot_scored_at: now
+        }, synchronize_session=False)
+
+    @staticmethod
+    def rebuild_hot_scores(now=None):
+        """Recompute every hot score from recent comments in one UPDATE."""
+        now = now or datetime.utcnow()
+        since = now - timedelta(hours=HOT_FEED_CONFIG['rebuild_window_hours'])
+        recent = select(
+            func.coalesce(func.sum(CommunityService._decay(CommunityComment.created_at, now)), 0.0)
+        ).where(
+            CommunityComment.post_id == CommunityPost.id, CommunityComment.created_at >= since
+        ).scalar_subquery()
+        return CommunityPost.query.update(
+            {CommunityPost.hot_score: recent, CommunityPost.hot_scored_at: now}, synchronize_session=False
+        )
+
+    @staticmethod
+    def hide_posts(post_ids):
+        """Soft-hide posts and drop them and their comments from search; returns the number hidden."""
+        if not post_ids:
+            return 0
+        SearchService.set_groups_visibility("community", post_ids, False)
+        return CommunityPost.query.filter(CommunityPost.id.in_(post_ids)).update(
+            {CommunityPost.is_hidden: True}, synchronize_session=False
+        )
+
+    @staticmethod
+    def delete_comments(comment_ids):
+        """Delete comments by id and decrement their posts' counts; returns the number removed.
+
+        Flags raised on the comments keep their history but lose the link, so
+        the delete never trips content_flag's foreign key.
+        """
+        if not comment_ids:
+            return 0
+        removed_here = db.session.query(func.count(CommunityComment.id)).filter(
+            CommunityComment.post_id == CommunityPost.id, CommunityComment.id.in_(comment_ids)
+        ).scalar_subquery()
+        touched_posts = db.session.query(CommunityComment.post_id).filter(CommunityComment.id.in_(comment_ids))
+
+        CommunityPost.query.filter(CommunityPost.id.in_(touched_posts)).update(
+            {CommunityPost.comment_count: CommunityPost.comment_count - removed_here}, synchronize_session=False
+        )
+        SearchService.remove("comment", comment_ids)
+        ContentFlag.query.filter(ContentFlag.comment_id.in_(comment_ids)).update(
+            {ContentFlag.comment_id: None}, synchronize_session=False
+        )
+        return CommunityComment.query.filter(CommunityComment.id.in_(comment_ids)).delete(synchronize_session=False)
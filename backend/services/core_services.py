@@ -1,18 +1,23 @@
+import math
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import func, case
 from models import (
     db,
+    path_contributors,
+    path_followers,
     User,
     Badge,
     UserBadge,
     PointsLog,
     UserProgress,
+    UserPathProgress,
     LearningPath,
     Module,
     ChallengeParticipation,
     Leaderboard
 )
-from utils.constants import POINTS_CONFIG, XP_CONFIG, BADGE_RULES
+from utils.cache import shared_cache
+from utils.constants import POINTS_CONFIG, XP_CONFIG, BADGE_RULES, TRENDING_CONFIG
 
 
 class PointsService:
@@ -177,32 +182,10 @@ class BadgeService:
     @staticmethod
     def _get_completed_learning_paths(user):
         """Count completed learning paths (all modules complete)"""
-        # Get all learning paths
-        all_paths = LearningPath.query.all()
-        completed_count = 0
-        
-        for path in all_paths:
-            # Get all modules in this path
-            path_modules = Module.query.filter_by(learning_path_id=path.id).all()
-            if not path_modules:
-                continue
-                
-            # Check if user completed all modules in this path
-            completed_modules_in_path = 0
-            for module in path_modules:
-                progress = UserProgress.query.filter_by(
-                    user_id=user.id,
-                    module_id=module.id,
-                    completion_percent=100
-                ).first()
-                if progress:
-                    completed_modules_in_path += 1
-            
-            # If all modules completed, count this path
-            if completed_modules_in_path == len(path_modules):
-                completed_count += 1
-        
-        return completed_count
+        return UserPathProgress.query.filter(
+            UserPathProgress.user_id == user.id,
+            UserPathProgress.completed_at.isnot(None)
+        ).count()
 
     @staticmethod
     def has_badge(user, badge_key):
@@ -378,4 +361,177 @@ class LeaderboardService:
         db.session.commit()
         
         # Update ranks
-        LeaderboardService.update_all_ranks()
\ No newline at end of file
+        LeaderboardService.update_all_ranks()
+
+
+class PathProgressService:
+    """Keeps user_path_progress rows in step with module progress and path structure."""
+
+    @staticmethod
+    def _set_percent(row):
+        row.percent = row.completed_modules * 100 // row.total_modules if row.total_modules else 0
+        if row.total_modules and row.completed_modules >= row.total_modules:
+            row.completed_at = row.completed_at or datetime.utcnow()
+        else:
+            row.completed_at = None
+
+    @staticmethod
+    def rebuild(user_id, path_id):
+        """Create or recompute a user's row for one path from UserProgress."""
+        db.session.flush()
+        total = Module.query.filter_by(learning_path_id=path_id).count()
+        completed = UserProgress.query.join(Module, Module.id == UserProgress.module_id).filter(
+            Module.learning_path_id == path_id,
+            UserProgress.user_id == user_id,
+            UserProgress.completion_percent == 100
+        ).count()
+
+        row = UserPathProgress.query.filter_by(user_id=user_id, path_id=path_id).first()
+        if not row:
+            row = UserPathProgress(user_id=user_id, path_id=path_id)
+            db.session.add(row)
+        row.total_modules = total
+        row.completed_modules = completed
+        PathProgressService._set_percent(row)
+        return row
+
+    @staticmethod
+    def module_progress_changed(user_id, path_id, was_completed, is_completed):
+        """Apply one module's completion change; call before committing the progress.
+
+        Returns None for modules that are not part of a learning path.
+        """
+        if path_id is None:
+            return None
+        row = UserPathProgress.query.filter_by(user_id=user_id, path_id=path_id).first()
+        if is_completed and not was_completed:
+            TrendingService.record(path_id, 'complete_module')
+        if not row:
+            return PathProgressService.rebuild(user_id, path_id)
+        if was_completed != is_completed:
+            row.completed_modules += 1 if is_completed else -1
+            PathProgressService._set_percent(row)
+        return row
+
+    @staticmethod
+    def module_added(path_id):
+        """A new module makes every learner's path one module longer."""
+        UserPathProgress.query.filter_by(path_id=path_id).update({
+            UserPathProgress.total_modules: UserPathProgress.total_modules + 1,
+            UserPathProgress.percent: UserPathProgress.completed_modules * 100 // (UserPathProgress.total_modules + 1),
+            UserPathProgress.completed_at: None
+        }, synchronize_session=False)
+
+    @staticmethod
+    def module_removed(path_id, module_id):
+        """Call before deleting a module, while its progress rows still exist."""
+        completed_by = db.session.query(UserProgress.user_id).filter(
+            UserProgress.module_id == module_id,
+            UserProgress.completion_percent == 100
+        )
+        UserPathProgress.query.filter(
+            UserPathProgress.path_id == path_id,
+            UserPathProgress.user_id.in_(completed_by)
+        ).update({
+            UserPathProgress.completed_modules: UserPathProgress.completed_modules - 1
+        }, synchronize_session=False)
+
+        remaining = UserPathProgress.total_modules - 1
+        UserPathProgress.query.filter_by(path_id=path_id).update({
+            UserPathProgress.total_modules: remaining,
+            UserPathProgress.percent: case(
+                (remaining > 0, UserPathProgress.completed_modules * 100 // remaining), else_=0
+            ),
+            UserPathProgress.completed_at: case(
+                (db.and_(remaining > 0, UserPathProgress.completed_modules >= remaining),
+                 func.coalesce(UserPathProgress.completed_at, datetime.utcnow())),
+                else_=None
+            )
+        }, synchronize_session=False)
+
+
+class PathCounterService:
+    """Maintains LearningPath.module_count, contributor_count and follower_count.
+
+    Each change is a single UPDATE in the caller's transaction, so the
+    counter commits or rolls back together with the row it counts. Nothing
+    edits path_contributors yet; contributor_count comes from `recompute`.
+    """
+
+    @staticmethod
+    def adjust(path_id, **deltas):
+        LearningPath.query.filter_by(id=path_id).update({
+            getattr(LearningPath, column): getattr(LearningPath, column) + delta
+            for column, delta in deltas.items()
+        })
+
+    @staticmethod
+    def recompute(path_ids=None):
+        """Recount every counter from the source tables in one UPDATE."""
+        module_count = db.session.query(func.count(Module.id)).filter(
+            Module.learning_path_id == LearningPath.id
+        ).scalar_subquery()
+        contributor_count = db.session.query(func.count()).select_from(path_contributors).filter(
+            path_contributors.c.path_id == LearningPath.id
+        ).scalar_subquery()
+        follower_count = db.session.query(func.count()).select_from(path_followers).filter(
+            path_followers.c.path_id == LearningPath.id
+        ).scalar_subquery()
+
+        query = LearningPath.query
+        if path_ids is not None:
+            query = query.filter(LearningPath.id.in_(path_ids))
+        return query.update({
+            LearningPath.module_count: module_count,
+            LearningPath.contributor_count: contributor_count,
+            LearningPath.follower_count: follower_count
+        }, synchronize_session=False)
+
+
+class TrendingService:
+    """Exponentially decayed popularity per learning path.
+
+    The decayed score sum(w * exp(-rate * (now - t))) shrinks for every path
+    at the same rate, so ordering by it never changes unless an event
+    arrives. We therefore store ln(sum(w * exp(rate * (t - epoch)))), which
+    orders paths identically, only changes when an event is recorded, and
+    stays a small number in log space. Paths with no activity keep 0.
+
+    Catalogue pages sorted by this score are cached in their own namespace,
+    so module completions can drop them without emptying the whole catalogue.
+    """
+
+    CACHE_NAMESPACE = "catalogue_trending"
+
+    @staticmethod
+    def _rate():
+        return math.log(2) / (TRENDING_CONFIG['half_life_hours'] * 3600)
+
+    @staticmethod
+    def event_score(event, at=None):
+        weight = TRENDING_CONFIG['weights'][event]
+        epoch = datetime.utcfromtimestamp(TRENDING_CONFIG['epoch_timestamp'])
+        elapsed = ((at or datetime.utcnow()) - epoch).total_seconds()
+        return math.log(weight) + TrendingService._rate() * elapsed
+
+    @staticmethod
+    def record(path_id, event, at=None):
+        """Fold one event into the path's score; call inside the event's transaction."""
+        current = db.session.query(LearningPath.trending_score).filter_by(id=path_id).with_for_update().scalar()
+        if current is None:
+            return
+        incoming = TrendingService.event_score(event, at)
+        if current == 0:
+            score = incoming
+        else:
+            # log(exp(a) + exp(b)) without overflow
+            high, low = max(current, incoming), min(current, incoming)
+            score = high + math.log1p(math.exp(low - high))
+        LearningPath.query.filter_by(id=path_id).update(
+            {LearningPath.trending_score: score}, synchronize_session=False
+        )
+
+    @staticmethod
+    def invalidate_pages():
+        """Drop cached trending catalogue pages in every worker; call after committing."""
+        shared_cache.invalidate(TrendingService.CACHE_NAMESPACE)
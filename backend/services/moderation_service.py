@@ -0,0 +1,102 @@
+import math
+from datetime import datetime
+from sqlalchemy import select
+from models import db, ContentFlag, ReviewItem, ContentStatusEnum
+from services.community_service import CommunityService
+from utils.constants import REVIEW_QUEUE_CONFIG
+
+
+class ReviewQueueService:
+    """One review item per reported post or comment.
+
+    Flags still record every report; the item aggregates them (report count,
+    distinct reporters, first and last report) so moderators act on content
+    instead of on individual reports. Priority is the log-space decayed sum
+    TrendingService uses: each report adds a weight that halves every
+    half_life_hours, and the stored value only changes when a report arrives,
+    so the (status, priority) index serves the queue as is.
+    """
+
+    @staticmethod
+    def report_score(is_new_reporter, at=None):
+        weights = REVIEW_QUEUE_CONFIG['weights']
+        weight = weights['reporter'] if is_new_reporter else weights['repeat_report']
+        rate = math.log(2) / (REVIEW_QUEUE_CONFIG['half_life_hours'] * 3600)
+        epoch = datetime.utcfromtimestamp(REVIEW_QUEUE_CONFIG['epoch_timestamp'])
+        elapsed = ((at or datetime.utcnow()) - epoch).total_seconds()
+        return math.log(weight) + rate * elapsed
+
+    @staticmethod
+    def record_report(flag, is_new_reporter):
+        """Fold a new flag into its content's item, opening or reopening it; call before committing the flag."""
+        content_type, content_id = ("post", flag.post_id) if flag.post_id else ("comment", flag.comment_id)
+        now = flag.created_at or datetime.utcnow()
+        incoming = ReviewQueueService.report_score(is_new_reporter, now)
+
+        item = ReviewItem.query.filter_by(
+            content_type=content_type, content_id=content_id
+        ).with_for_update().first()
+        if item is None:
+            item = ReviewItem(
+                content_type=content_type,
+                content_id=content_id,
+                report_count=0,
+                reporter_count=0,
+                first_reported_at=now,
+                priority=incoming
+            )
+            db.session.add(item)
+        else:
+            # log(exp(a) + exp(b)) without overflow
+            high, low = max(item.priority, incoming), min(item.priority, incoming)
+            item.priority = high + math.log1p(math.exp(low - high))
+
+        if item.status != ContentStatusEnum.pending:
+            item.status = ContentStatusEnum.pending
+            item.resolved_at = None
+            item.resolved_by_id = None
+        item.report_count += 1
+        if is_new_reporter:
+            item.reporter_count += 1
+        item.last_reported_at = now
+        flag.review_item = item
+        return item
+
+    @staticmethod
+    def resolve(item, action, admin_id, admin_notes=None):
+        """Act on the content and close every pending flag on it; returns the number of flags closed."""
+        status = ContentStatusEnum.approved if action == "approve" else ContentStatusEnum.rejected
+        if action == "approve":
+            if item.content_type == "post":
+                CommunityService.hide_posts([item.content_id])
+            else:
+                CommunityService.delete_comments([item.content_id])
+
+        values = {ContentFlag.status: status}
+        if admin_notes:
+            values[ContentFlag.admin_notes] = admin_notes
+        closed = ContentFlag.query.filter(
+            ContentFlag.review_item_id == item.id, ContentFlag.status == ContentStatusEnum.pending
+        ).update(values, synchronize_session=False)
+
+        item.status = status
+        item.resolved_by_id = admin_id
+        item.resolved_at = datetime.utcnow()
+        if admin_notes:
+            item.admin_notes = admin_notes
+        return closed
+
+    @staticmethod
+    def settle_items(flag_ids, status, admin_id):
+        """Close the items of flags resolved one by one once none of their flags is pending."""
+        still_pending = select(ContentFlag.id).where(
+            ContentFlag.review_item_id == ReviewItem.id, ContentFlag.status == ContentStatusEnum.pending
+        ).exists()
+        touched = select(ContentFlag.review_item_id).where(ContentFlag.id.in_(flag_ids))
+        return ReviewItem.query.filter(
+            ReviewItem.id.in_(touched), ReviewItem.status == ContentStatusEnum.pending, ~still_pending
+        ).update({
+            ReviewItem.status: status,
+            ReviewItem.resolved_by_id: admin_id,
+            ReviewItem.resolved_at: datetime.utcnow()
+        }, synchronize_session=False)
@@ -1,8 +1,187 @@
-from models import db, Quiz, Question, Choice, UserProgress, Module, UserChallenge
-from services.core_services import PointsService
+import csv
+import io
+import json
+import random
+from sqlalchemy import insert, and_, or_
+from models import db, Quiz, Question, Choice, UserProgress, Module, UserChallenge, UserQuizSummary, User
+from services.core_services import PointsService, PathProgressService
+from utils.cache import LRUCache
 from datetime import datetime
 
+MAX_IMPORT_QUESTIONS = 1000
+
+# Leaderboard pages keyed by (quiz_id, cache_version, cursor, limit)
+leaderboard_cache = LRUCache(maxsize=512)
+
 class QuizService:
+    @staticmethod
+    def bank_question_ids(quiz_id):
+        """Question ids of a quiz, straight from the question table."""
+        return [
+            question_id for (question_id,) in
+            db.session.query(Question.id).filter_by(quiz_id=quiz_id).order_by(Question.id)
+        ]
+
+    @staticmethod
+    def refresh_question_bank(quiz):
+        """Recompute the quiz's precomputed array of question ids."""
+        quiz.question_ids = QuizService.bank_question_ids(quiz.id)
+        return quiz.question_ids
+
+    @staticmethod
+    def question_bank(quiz):
+        """Return the quiz's question ids, computing them once if missing."""
+        if quiz.question_ids is None:
+            return QuizService.refresh_question_bank(quiz)
+        return quiz.question_ids
+
+    @staticmethod
+    def draw_questions(quiz):
+        """Draw K of the N bank ids for one attempt (all of them if K is unset)."""
+        bank = QuizService.question_bank(quiz)
+        if quiz.draw_count and quiz.draw_count < len(bank):
+            return sorted(random.sample(bank, quiz.draw_count))
+        return list(bank)
+
+    @staticmethod
+    def load_questions(question_ids):
+        """Public payload for the given questions, loaded with two queries."""
+        if not question_ids:
+            return []
+        questions = Question.query.filter(Question.id.in_(question_ids)).order_by(Question.id).all()
+        choices = Choice.query.filter(Choice.question_id.in_(question_ids)).order_by(Choice.id).all()
+
+        choices_by_question = {}
+        for choice in choices:
+            choices_by_question.setdefault(choice.question_id, []).append(choice.to_public_dict())
+
+        return [{
+            "id": q.id,
+            "text": q.text,
+            "choices": choices_by_question.get(q.id, [])
+        } for q in questions]
+
+    @staticmethod
+    def grade_answers(question_ids, answers):
+        """Grade submitted answers against the given questions only.
+
+        Returns (correct_count, graded) where graded is a list of
+        (question_id, choice_id, is_correct) tuples, one per answered question.
+        """
+        allowed = set(question_ids)
+        selected = {}
+        for ans in answers:
+            try:
+                question_id, choice_id = int(ans["question_id"]), int(ans["choice_id"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if question_id in allowed and question_id not in selected:
+                selected[question_id] = choice_id
+
+        if not selected:
+            return 0, []
+
+        choices = {
+            choice_id: (question_id, is_correct)
+            for choice_id, question_id, is_correct in db.session.query(
+                Choice.id, Choice.question_id, Choice.is_correct
+            ).filter(Choice.id.in_(selected.values())).all()
+        }
+
+        graded = []
+        correct_count = 0
+        for question_id, choice_id in selected.items():
+            # A choice only counts for the question it belongs to
+            if choice_id not in choices or choices[choice_id][0] != question_id:
+                continue
+            is_correct = bool(choices[choice_id][1])
+            correct_count += is_correct
+            graded.append((question_id, choice_id, is_correct))
+        return correct_count, graded
+
+    @staticmethod
+    def record_attempt_summary(user_id, quiz_id, score, passed, completed_at):
+        """Fold a graded attempt into the user's summary row for the quiz."""
+        summary = UserQuizSummary.query.filter_by(user_id=user_id, quiz_id=quiz_id).first()
+        if not summary:
+            summary = UserQuizSummary(user_id=user_id, quiz_id=quiz_id, attempt_count=0)
+            db.session.add(summary)
+
+        summary.attempt_count += 1
+        summary.last_score = score
+        summary.last_attempt_at = completed_at
+        if summary.best_score is None or score > summary.best_score:
+            summary.best_score = score
+            summary.best_at = completed_at
+            # Ranking changed: invalidate cached leaderboard pages for this quiz
+            Quiz.query.filter_by(id=quiz_id).update(
+                {Quiz.cache_version: Quiz.cache_version + 1}, synchronize_session=False
+            )
+        if passed and not summary.passed_at:
+            summary.passed_at = completed_at
+        return summary
+
+    @staticmethod
+    def get_leaderboard_page(quiz, cursor=None, limit=20):
+        """Rank users by best score, then by who reached it first.
+
+        Served from the summary leaderboard index with keyset pagination;
+        `cursor` is the opaque `next_cursor` of the previous page.
+        """
+        cache_key = (quiz.id, quiz.cache_version, cursor, limit)
+        cached = leaderboard_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        query = db.session.query(
+            UserQuizSummary.user_id, User.username, UserQuizSummary.best_score,
+            UserQuizSummary.best_at, UserQuizSummary.attempt_count
+        ).join(User, User.id == UserQuizSummary.user_id).filter(
+            UserQuizSummary.quiz_id == quiz.id,
+            UserQuizSummary.best_score.isnot(None)
+        )
+
+        rank = 0
+        if cursor:
+            try:
+                score, best_at, user_id, rank = cursor.split("_")
+                score, user_id, rank = int(score), int(user_id), int(rank)
+                best_at = datetime.fromisoformat(best_at)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+            query = query.filter(or_(
+                UserQuizSummary.best_score < score,
+                and_(UserQuizSummary.best_score == score, UserQuizSummary.best_at > best_at),
+                and_(UserQuizSummary.best_score == score, UserQuizSummary.best_at == best_at,
+                     UserQuizSummary.user_id > user_id)
+            ))
+
+        rows = query.order_by(
+            UserQuizSummary.best_score.desc(),
+            UserQuizSummary.best_at.asc(),
+            UserQuizSummary.user_id.asc()
+        ).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        entries = [{
+            "rank": rank + position,
+            "user_id": row.user_id,
+            "username": row.username,
+            "best_score": row.best_score,
+            "achieved_at": row.best_at.isoformat() if row.best_at else None,
+            "attempt_count": row.attempt_count
+        } for position, row in enumerate(rows, start=1)]
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = f"{last.best_score}_{last.best_at.isoformat()}_{last.user_id}_{rank + len(rows)}"
+
+        page = {"quiz_id": quiz.id, "leaderboard": entries, "next_cursor": next_cursor}
+        leaderboard_cache.set(cache_key, page)
+        return page
+
     @staticmethod
     def evaluate_quiz(user, quiz_id, user_answers):
         quiz = Quiz.query.get(quiz_id)
@@ -28,6 +207,7 @@ class QuizService:
         if quiz.module:
             module = quiz.module
             progress = UserProgress.query.filter_by(user_id=user.id, module_id=module.id).first()
+            was_completed = progress is not None and progress.completion_percent == 100
             if not progress:
                 progress = UserProgress(user_id=user.id, module_id=module.id)
 
@@ -36,6 +216,7 @@ class QuizService:
             if passed:
                 progress.completed_at = datetime.utcnow()
             db.session.add(progress)
+            PathProgressService.module_progress_changed(user.id, module.learning_path_id, was_completed, passed)
             db.session.commit()
 
         # Handle challenge-linked quiz
@@ -65,4 +246,122 @@ class QuizService:
             "correct_answers": correct_answers
         }
 
-   
\ No newline at end of file
+
+class QuizImportService:
+    """Validates whole quiz documents in memory and bulk-inserts them."""
+
+    @staticmethod
+    def parse(raw, fmt):
+        """Parse a raw JSON or CSV payload into (metadata, questions)."""
+        if fmt == "json":
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                raise ValueError("Quiz document is not valid JSON.")
+            return data, QuizImportService.parse_document(data)
+        if fmt == "csv":
+            return {}, QuizImportService.parse_csv(raw)
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    @staticmethod
+    def parse_document(data):
+        """Validate a JSON quiz document: {"title", "passing_score", "questions": [...]}."""
+        if not isinstance(data, dict):
+            raise ValueError("Quiz document must be a JSON object.")
+        return QuizImportService.validate_questions(data.get("questions"))
+
+    @staticmethod
+    def parse_csv(text):
+        """Validate a CSV with a `question,answer,choice_1,choice_2,...` header.
+
+        `answer` holds the 1-based number of the correct choice; several
+        correct choices are separated with `|`.
+        """
+        reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+        fields = [f.strip().lower() for f in (reader.fieldnames or [])]
+        reader.fieldnames = fields
+        choice_columns = [f for f in fields if f.startswith("choice")]
+        if "question" not in fields or "answer" not in fields or not choice_columns:
+            raise ValueError("CSV header must contain 'question', 'answer' and choice columns.")
+
+        questions = []
+        for row in reader:
+            correct = {part.strip() for part in (row.get("answer") or "").split("|")}
+            questions.append({
+                "text": row.get("question"),
+                "choices": [
+                    {"text": row.get(column), "is_correct": str(number) in correct}
+                    for number, column in enumerate(choice_columns, start=1)
+                    if (row.get(column) or "").strip()
+                ]
+            })
+        return QuizImportService.validate_questions(questions)
+
+    @staticmethod
+    def validate_questions(questions):
+        """Return cleaned question dicts, or raise ValueError listing what is wrong."""
+        if not isinstance(questions, list) or not questions:
+            raise ValueError("At least one question is required.")
+        if len(questions) > MAX_IMPORT_QUESTIONS:
+            raise ValueError(f"A single import is limited to {MAX_IMPORT_QUESTIONS} questions.")
+
+        cleaned = []
+        errors = []
+        seen_texts = set()
+        for number, question in enumerate(questions, start=1):
+            if not isinstance(question, dict):
+                errors.append(f"Question {number}: must be an object")
+                continue
+            text = str(question.get("text") or "").strip()
+            choices = question.get("choices")
+            if not text:
+                errors.append(f"Question {number}: text is required")
+                continue
+            if text in seen_texts:
+                errors.append(f"Question {number}: duplicate question text")
+                continue
+            seen_texts.add(text)
+            if not isinstance(choices, list) or len(choices) < 2:
+                errors.append(f"Question {number}: at least two choices are required")
+                continue
+
+            cleaned_choices = [
+                {"text": str(c.get("text") or "").strip(), "is_correct": bool(c.get("is_correct", False))}
+                for c in choices if isinstance(c, dict)
+            ]
+            if len(cleaned_choices) != len(choices) or not all(c["text"] for c in cleaned_choices):
+                errors.append(f"Question {number}: every choice needs text")
+            elif not any(c["is_correct"] for c in cleaned_choices):
+                errors.append(f"Question {number}: no correct choice marked")
+            else:
+                cleaned.append({"text": text, "choices": cleaned_choices})
+
+        if errors:
+            raise ValueError("; ".join(errors[:20]))
+        return cleaned
+
+    @staticmethod
+    def import_questions(quiz, questions):
+        """Insert questions and choices with two bulk statements and one commit."""
+        if quiz.id is None:
+            db.session.add(quiz)
+            db.session.flush()
+        else:
+            quiz.cache_version = Quiz.cache_version + 1
+
+        # Question texts are unique within a document, so RETURNING (id, text)
+        # maps ids back without forcing row-by-row ordered inserts.
+        ids_by_text = dict(db.session.execute(
+            insert(Question).returning(Question.text, Question.id),
+            [{"quiz_id": quiz.id, "text": q["text"]} for q in questions]
+        ).all())
+
+        db.session.execute(insert(Choice), [
+            {"question_id": ids_by_text[q["text"]], "text": c["text"], "is_correct": c["is_correct"]}
+            for q in questions
+            for c in q["choices"]
+        ])
+
+        QuizService.refresh_question_bank(quiz)
+        db.session.commit()
+        return [ids_by_text[q["text"]] for q in questions]
@@ -0,0 +1,95 @@
+from sqlalchemy import func, and_, insert, select
+from models import db, path_followers, LearningPath, PathRecommendation
+from utils.constants import RECOMMENDATION_CONFIG
+
+
+class RecommendationService:
+    """Learners-also-followed recommendations from co-follow counts.
+
+    `rebuild` is the periodic batch job (run `flask rebuild-recommendations`
+    from cron): the database counts every co-followed pair with one self-join
+    on path_followers and keeps the top K per path. Requests only read the
+    stored neighbours.
+    """
+
+    @staticmethod
+    def rebuild(k=None, min_co_followers=None):
+        """Replace every stored neighbour list; returns the number of rows written."""
+        k = k or RECOMMENDATION_CONFIG['neighbours_per_path']
+        min_co_followers = min_co_followers or RECOMMENDATION_CONFIG['min_co_followers']
+
+        a = path_followers.alias("a")
+        b = path_followers.alias("b")
+        pairs = select(
+            a.c.path_id.label("path_id"),
+            b.c.path_id.label("other_id"),
+            func.count().label("co_followers")
+        ).select_from(
+            a.join(b, and_(a.c.user_id == b.c.user_id, a.c.path_id != b.c.path_id))
+        ).group_by(a.c.path_id, b.c.path_id).having(func.count() >= min_co_followers).subquery()
+
+        sizes = select(
+            path_followers.c.path_id, func.count().label("followers")
+        ).group_by(path_followers.c.path_id).subquery()
+        size_a = sizes.alias("size_a")
+        size_b = sizes.alias("size_b")
+
+        # Jaccard: shared followers over the union of both follower sets
+        score = pairs.c.co_followers * 1.0 / (size_a.c.followers + size_b.c.followers - pairs.c.co_followers)
+        scored = select(
+            pairs.c.path_id,
+            pairs.c.other_id,
+            pairs.c.co_followers,
+            score.label("score"),
+            func.row_number().over(
+                partition_by=pairs.c.path_id,
+                order_by=(score.desc(), pairs.c.co_followers.desc(), pairs.c.other_id)
+            ).label("rank")
+        ).join(
+            size_a, size_a.c.path_id == pairs.c.path_id
+        ).join(
+            size_b, size_b.c.path_id == pairs.c.other_id
+        ).subquery()
+
+        PathRecommendation.query.delete(synchronize_session=False)
+        result = db.session.execute(insert(PathRecommendation).from_select(
+            ["path_id", "recommended_path_id", "co_followers", "score", "rank"],
+            select(scored.c.path_id, scored.c.other_id, scored.c.co_followers, scored.c.score, scored.c.rank)
+            .where(scored.c.rank <= k)
+        ))
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def for_path(path_id, limit=10):
+        """Published paths most often followed together with `path_id`."""
+        return db.session.query(
+            LearningPath.id, LearningPath.title, LearningPath.description,
+            LearningPath.follower_count, PathRecommendation.score
+        ).select_from(PathRecommendation).join(
+            LearningPath, LearningPath.id == PathRecommendation.recommended_path_id
+        ).filter(
+            PathRecommendation.path_id == path_id,
+            LearningPath.is_published == True
+        ).order_by(PathRecommendation.rank).limit(limit).all()
+
+    @staticmethod
+    def for_user(user_id, limit=10):
+        """Neighbours of every path the user follows, summed, minus what they already follow."""
+        mine = path_followers.alias("mine")
+        already = path_followers.alias("already")
+        return db.session.query(
+            LearningPath.id, LearningPath.title, LearningPath.description,
+            LearningPath.follower_count, func.sum(PathRecommendation.score).label("score")
+        ).select_from(PathRecommendation).join(
+            mine, and_(mine.c.path_id == PathRecommendation.path_id, mine.c.user_id == user_id)
+        ).join(
+            LearningPath, LearningPath.id == PathRecommendation.recommended_path_id
+        ).outerjoin(
+            already, and_(already.c.path_id == PathRecommendation.recommended_path_id, already.c.user_id == user_id)
+        ).filter(
+            already.c.user_id.is_(None),
+            LearningPath.is_published == True
+        ).group_by(
+            LearningPath.id, LearningPath.title, LearningPath.description, LearningPath.follower_count
+        ).order_by(func.sum(PathRecommendation.score).desc(), LearningPath.id).limit(limit).all()
@@ -0,0 +1,274 @@
+import re
+from sqlalchemy import text, insert, select, literal
+from models import db, SearchDocument, LearningPath, Module, LearningResource, CommunityPost, CommunityComment
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_document_fts USING fts5(
+        title, body, content='search_document', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS search_document_ai AFTER INSERT ON search_document BEGIN
+        INSERT INTO search_document_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_document_ad AFTER DELETE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_document_au AFTER UPDATE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_document_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+
+POSTGRES_VECTOR = (
+    "(setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'B'))"
+)
+
+# Scores are rounded before they are ordered on or put in a cursor, so the
+# keyset comparison sees exactly the value the previous page was cut at
+SCORE_DECIMALS = 6
+
+POSTGRES_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_search_document_tsv ON search_document USING GIN ({POSTGRES_VECTOR})",
+]
+
+
+class SearchService:
+    """Keeps search_document in sync with content and runs ranked full-text queries.
+
+    SQLite indexes the table with an external-content FTS5 table fed by triggers;
+    PostgreSQL uses a GIN index over a weighted tsvector expression.
+    """
+
+    @staticmethod
+    def _dialect():
+        return db.session.get_bind().dialect.name
+
+    @staticmethod
+    def install():
+        """Create the dialect's index structures if they are missing."""
+        ddl = POSTGRES_DDL if SearchService._dialect() == "postgresql" else SQLITE_DDL
+        for statement in ddl:
+            db.session.execute(text(statement))
+
+    @staticmethod
+    def index(scope, kind, ref_id, title, body, group_id=None, parent_id=None, is_visible=True):
+        doc = SearchDocument.query.filter_by(kind=kind, ref_id=ref_id).first()
+        if not doc:
+            doc = SearchDocument(scope=scope, kind=kind, ref_id=ref_id)
+            db.session.add(doc)
+        doc.title = title
+        doc.body = body
+        doc.group_id = group_id
+        doc.parent_id = parent_id
+        doc.is_visible = is_visible
+        return doc
+
+    @staticmethod
+    def remove(kind, ref_ids):
+        SearchDocument.query.filter(
+            SearchDocument.kind == kind, SearchDocument.ref_id.in_(ref_ids)
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def remove_children(kind, parent_id):
+        SearchDocument.query.filter_by(kind=kind, parent_id=parent_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def remove_group(scope, group_id):
+        SearchDocument.query.filter_by(scope=scope, group_id=group_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def set_group_visibility(scope, group_id, is_visible):
+        SearchService.set_groups_visibility(scope, [group_id], is_visible)
+
+    @staticmethod
+    def set_groups_visibility(scope, group_ids, is_visible):
+        SearchDocument.query.filter(
+            SearchDocument.scope == scope, SearchDocument.group_id.in_(group_ids)
+        ).update({SearchDocument.is_visible: bool(is_visible)}, synchronize_session=False)
+
+    # Learning content
+
+    @staticmethod
+    def index_path(path):
+        db.session.flush()
+        return SearchService.index("learning", "path", path.id, path.title, path.description,
+                                   group_id=path.id, is_visible=bool(path.is_published))
+
+    @staticmethod
+    def index_module(module, path):
+        db.session.flush()
+        return SearchService.index("learning", "module", module.id, module.title, module.description,
+                                   group_id=path.id, is_visible=bool(path.is_published))
+
+    @staticmethod
+    def index_resource(resource, module):
+        db.session.flush()
+        path = module.learning_path
+        body = " ".join(part for part in (resource.description, resource.content) if part)
+        return SearchService.index("learning", "resource", resource.id, resource.title, body,
+                                   group_id=module.learning_path_id, parent_id=module.id,
+                                   is_visible=bool(path.is_published) if path else False)
+
+    @staticmethod
+    def remove_module(module_id):
+        SearchService.remove("module", [module_id])
+        SearchService.remove_children("resource", module_id)
+
+    # Community content
+
+    @staticmethod
+    def index_post(post):
+        db.session.flush()
+        return SearchService.index("community", "post", post.id, post.title, post.content,
+                                   group_id=post.id, is_visible=not post.is_hidden)
+
+    @staticmethod
+    def index_comment(comment):
+        db.session.flush()
+        return SearchService.index("community", "comment", comment.id, None, comment.content,
+                                   group_id=comment.post_id)
+
+    @staticmethod
+    def reindex_learning():
+        """Rebuild every learning document from the source tables in three INSERT ... SELECTs."""
+        SearchDocument.query.filter_by(scope="learning").delete(synchronize_session=False)
+        columns = ["scope", "kind", "ref_id", "group_id", "parent_id", "title", "body", "is_visible"]
+
+        db.session.execute(insert(SearchDocument).from_select(columns, select(
+            literal("learning"), literal("path"), LearningPath.id, LearningPath.id, literal(None),
+            LearningPath.title, LearningPath.description, LearningPath.is_published
+        )))
+        db.session.execute(insert(SearchDocument).from_select(columns, select(
+            literal("learning"), literal("module"), Module.id, Module.learning_path_id, literal(None),
+            Module.title, Module.description, LearningPath.is_published
+        ).join(LearningPath, LearningPath.id == Module.learning_path_id)))
+        db.session.execute(insert(SearchDocument).from_select(columns, select(
+            literal("learning"), literal("resource"), LearningResource.id, Module.learning_path_id, Module.id,
+            LearningResource.title,
+            db.func.coalesce(LearningResource.description, "") + " " + db.func.coalesce(LearningResource.content, ""),
+            LearningPath.is_published
+        ).join(Module, Module.id == LearningResource.module_id
+        ).join(LearningPath, LearningPath.id == Module.learning_path_id)))
+
+        return SearchDocument.query.filter_by(scope="learning").count()
+
+    @staticmethod
+    def reindex_community():
+        """Rebuild every community document from posts and comments."""
+        SearchDocument.query.filter_by(scope="community").delete(synchronize_session=False)
+        columns = ["scope", "kind", "ref_id", "group_id", "title", "body", "is_visible"]
+
+        db.session.execute(insert(SearchDocument).from_select(columns, select(
+            literal("community"), literal("post"), CommunityPost.id, CommunityPost.id,
+            CommunityPost.title, CommunityPost.content, ~CommunityPost.is_hidden
+        )))
+        db.session.execute(insert(SearchDocument).from_select(columns, select(
+            literal("community"), literal("comment"), CommunityComment.id, CommunityComment.post_id,
+            literal(None), CommunityComment.content, ~CommunityPost.is_hidden
+        ).join(CommunityPost, CommunityPost.id == CommunityComment.post_id)))
+
+        return SearchDocument.query.filter_by(scope="community").count()
+
+    # Queries
+
+    @staticmethod
+    def _fts5_query(q):
+        tokens = TOKEN_RE.findall(q)
+        if not tokens:
+            return None
+        # Every term must match; the last one also matches as a prefix while typing
+        terms = [f'"{t}"' for t in tokens]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    @staticmethod
+    def encode_cursor(score, doc_id):
+        return f"{score}_{doc_id}"
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            score, doc_id = cursor.rsplit("_", 1)
+            return float(score), int(doc_id)
+        except (ValueError, AttributeError):
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def search(scope, q, limit=20, offset=0, cursor=None, include_hidden=False, with_total=True):
+        """Ranked search within one scope; returns (total, hits, next_cursor).
+
+        Pages either by `offset` or, when `cursor` is given (the previous
+        page's next_cursor), by keyset over (score, id). `total` is None
+        unless `with_total` is set.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        params = {"scope": scope, "limit": limit + 1, "offset": 0 if cursor is not None else offset}
+        visibility = "" if include_hidden else "AND d.is_visible"
+
+        if SearchService._dialect() == "postgresql":
+            if not TOKEN_RE.search(q):
+                return 0, [], None
+            params["q"] = q
+            # ts_rank is float4; round(real, int) does not exist, hence the numeric cast
+            score = f"round(ts_rank({POSTGRES_VECTOR}, query)::numeric, {SCORE_DECIMALS})"
+            source = (
+                f"FROM search_document d, websearch_to_tsquery('english', :q) query "
+                f"WHERE d.scope = :scope {visibility} AND {POSTGRES_VECTOR} @@ query"
+            )
+            columns = (
+                f"{score} AS score, "
+                "ts_headline('english', coalesce(d.body, d.title, ''), query, "
+                "'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8') AS snippet"
+            )
+        else:
+            match = SearchService._fts5_query(q)
+            if not match:
+                return 0, [], None
+            params["q"] = match
+            # SQLite resolves result aliases in WHERE, which keeps bm25 in one place
+            score = "score"
+            source = (
+                f"FROM search_document_fts JOIN search_document d ON d.id = search_document_fts.rowid "
+                f"WHERE search_document_fts MATCH :q AND d.scope = :scope {visibility}"
+            )
+            columns = (
+                # bm25 is lower-is-better; title matches weigh ten times body matches
+                f"round(-bm25(search_document_fts, 10.0, 1.0), {SCORE_DECIMALS}) AS score, "
+                "snippet(search_document_fts, -1, '<mark>', '</mark>', '...', 24) AS snippet"
+            )
+
+        total = None
+        if with_total:
+            total = db.session.execute(text(f"SELECT COUNT(*) {source}"), params).scalar()
+
+        seek = ""
+        if cursor is not None:
+            params["cursor_score"], params["cursor_id"] = SearchService.decode_cursor(cursor)
+            seek = f"AND ({score} < :cursor_score OR ({score} = :cursor_score AND d.id > :cursor_id))"
+
+        rows = db.session.execute(text(
+            f"SELECT d.id, d.kind, d.ref_id, d.group_id, d.parent_id, d.title, {columns} {source} {seek} "
+            f"ORDER BY score DESC, d.id LIMIT :limit OFFSET :offset"
+        ), params).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = SearchService.encode_cursor(rows[-1].score, rows[-1].id)
+
+        hits = [{
+            "type": kind,
+            "id": ref_id,
+            "group_id": group_id,
+            "parent_id": parent_id,
+            "title": title,
+            "snippet": snippet,
+            "score": float(score)
+        } for _, kind, ref_id, group_id, parent_id, title, score, snippet in rows]
+        return total, hits, next_cursor
@@ -0,0 +1,115 @@
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from flask import current_app
+from utils.constants import QUIZ_SESSION_CONFIG
+
+
+class QuizSession:
+    """A started quiz attempt: who, which quiz, which questions, and until when."""
+    __slots__ = ("user_id", "quiz_id", "attempt_id", "deadline", "question_ids")
+
+    def __init__(self, user_id, quiz_id, attempt_id, deadline, question_ids):
+        self.user_id = user_id
+        self.quiz_id = quiz_id
+        self.attempt_id = attempt_id
+        self.deadline = deadline
+        self.question_ids = question_ids
+
+    def is_expired(self, now=None, grace=0):
+        return (now or time.time()) > self.deadline + grace
+
+
+class QuizSessionStore:
+    """Quiz sessions kept in a per-worker dict and shared through a local SQLite file.
+
+    Lookups are a dict hit or a primary-key read on the SQLite file; neither
+    touches the application database. Expired sessions are swept in bulk.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_sweep = 0.0
+
+    def _connect(self):
+        # Resolved per call so each app uses its own file; connections are per thread and file
+        path = self.path or current_app.config.get("QUIZ_SESSION_DB") or os.path.join(
+            current_app.instance_path, "quiz_sessions.db"
+        )
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(path)
+        if conn is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS quiz_session ("
+                " token TEXT PRIMARY KEY, user_id INTEGER NOT NULL, quiz_id INTEGER NOT NULL,"
+                " attempt_id INTEGER NOT NULL, deadline REAL NOT NULL, question_ids TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_quiz_session_deadline ON quiz_session (deadline)")
+            conns[path] = conn
+        return conn
+
+    def create(self, user_id, quiz_id, attempt_id, ttl, question_ids):
+        """Issue a session token valid for `ttl` seconds."""
+        token = secrets.token_urlsafe(24)
+        session = QuizSession(user_id, quiz_id, attempt_id, time.time() + ttl, tuple(question_ids))
+        self._connect().execute(
+            "INSERT INTO quiz_session VALUES (?, ?, ?, ?, ?, ?)",
+            (token, user_id, quiz_id, attempt_id, session.deadline, json.dumps(question_ids))
+        )
+        with self._lock:
+            self._sessions[token] = session
+        self._maybe_sweep()
+        return token
+
+    def get(self, token):
+        """Return the session for `token`, or None if unknown or swept."""
+        with self._lock:
+            session = self._sessions.get(token)
+        if session is None:
+            row = self._connect().execute(
+                "SELECT user_id, quiz_id, attempt_id, deadline, question_ids FROM quiz_session WHERE token = ?",
+                (token,)
+            ).fetchone()
+            if row is None:
+                return None
+            session = QuizSession(row[0], row[1], row[2], row[3], tuple(json.loads(row[4])))
+            with self._lock:
+                self._sessions[token] = session
+        return session
+
+    def consume(self, token):
+        """Remove and return a session; only one worker can consume a given token."""
+        session = self.get(token)
+        if session is None:
+            return None
+        deleted = self._connect().execute("DELETE FROM quiz_session WHERE token = ?", (token,)).rowcount
+        with self._lock:
+            self._sessions.pop(token, None)
+        return session if deleted else None
+
+    def sweep(self, now=None):
+        """Evict every session whose deadline (plus grace) has passed."""
+        cutoff = (now or time.time()) - QUIZ_SESSION_CONFIG['grace_seconds']
+        with self._lock:
+            self._sessions = {t: s for t, s in self._sessions.items() if s.deadline >= cutoff}
+            self._last_sweep = time.time()
+        return self._connect().execute("DELETE FROM quiz_session WHERE deadline < ?", (cutoff,)).rowcount
+
+    def _maybe_sweep(self):
+        if time.time() - self._last_sweep >= QUIZ_SESSION_CONFIG['sweep_interval_seconds']:
+            self.sweep()
+
+
+quiz_sessions = QuizSessionStore()
@@ -0,0 +1,87 @@
+import atexit
+import threading
+import time
+from collections import Counter
+from flask import current_app
+from sqlalchemy import update, case
+from models import db, LearningPath, Module
+from utils.constants import VIEW_COUNTER_CONFIG
+
+
+class ViewCounter:
+    """Per-worker buffer of path and module views, written out in batches.
+
+    A read only bumps an in-memory Counter. Once the buffer is old or large
+    enough, the request that notices drains it with one UPDATE per table on
+    its own connection, so the caller's session is never touched. Module
+    views also count towards their path, which keeps a contributor's total
+    a plain sum over learning_path.
+    """
+
+    def __init__(self):
+        self._paths = Counter()
+        self._modules = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.time()
+        self._app = None
+
+    def record_path(self, path_id):
+        with self._lock:
+            self._paths[path_id] += 1
+        self._maybe_flush()
+
+    def record_module(self, module_id, path_id):
+        with self._lock:
+            self._modules[module_id] += 1
+            if path_id:
+                self._paths[path_id] += 1
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if self._app is None:
+            self._app = current_app._get_current_object()
+        pending = len(self._paths) + len(self._modules)
+        if (pending >= VIEW_COUNTER_CONFIG['flush_threshold']
+                or time.time() - self._last_flush >= VIEW_COUNTER_CONFIG['flush_interval_seconds']):
+            # The views stay buffered on failure; the page itself must still render
+            try:
+                self.flush()
+            except Exception:
+                current_app.logger.exception("Failed to flush buffered view counts")
+
+    def flush(self):
+        """Write buffered views; returns the number of rows touched."""
+        with self._lock:
+            paths, self._paths = self._paths, Counter()
+            modules, self._modules = self._modules, Counter()
+            self._last_flush = time.time()
+        if not paths and not modules:
+            return 0
+
+        try:
+            with db.engine.begin() as conn:
+                for model, counts in ((LearningPath, paths), (Module, modules)):
+                    if counts:
+                        conn.execute(update(model).where(model.id.in_(counts)).values(
+                            view_count=model.view_count + case(dict(counts), value=model.id, else_=0)
+                        ))
+        except Exception:
+            # Put the views back so a transient failure doesn't lose them
+            with self._lock:
+                self._paths.update(paths)
+                self._modules.update(modules)
+            raise
+        return len(paths) + len(modules)
+
+    def _flush_at_exit(self):
+        if self._app is None:
+            return
+        try:
+            with self._app.app_context():
+                self.flush()
+        except Exception:
+            pass
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter._flush_at_exit)
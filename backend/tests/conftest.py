@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from models import db, User, RoleEnum
+from routes import register_blueprints
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI="sqlite://",
+        SECRET_KEY="test-secret-key",
+        JWT_SECRET_KEY="test-jwt-secret-key-of-sufficient-length",
+        SHARED_CACHE_DB=str(tmp_path / "shared_cache.db"),
+        QUIZ_SESSION_DB=str(tmp_path / "quiz_sessions.db"),
+    )
+    db.init_app(app)
+    JWTManager(app)
+    register_blueprints(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    def make(username="learner", role=RoleEnum.learner):
+        user = User(username=username, email=f"{username}@example.com", password_hash="x", role=role)
+        db.session.add(user)
+        db.session.commit()
+        token = create_access_token(identity=str(user.id), additional_claims={"role": role.value})
+        return user, {"Authorization": f"Bearer {token}"}
+    return make
@@ -0,0 +1,19 @@
+from flask import Flask
+
+from services.session_store import QuizSessionStore
+from utils.cache import SharedCache
+
+
+def test_stores_use_the_current_apps_files(tmp_path):
+    cache, sessions = SharedCache(), QuizSessionStore()
+    for name in ("one", "two"):
+        app = Flask(name)
+        app.config.update(SHARED_CACHE_DB=str(tmp_path / f"{name}_cache.db"),
+                          QUIZ_SESSION_DB=str(tmp_path / f"{name}_sessions.db"))
+        with app.app_context():
+            assert cache.get("catalogue", "page")[0] is None
+            cache.set("catalogue", "page", name.encode(), 0, 60)
+            sessions.create(1, 1, 1, 60, [1])
+
+    assert (tmp_path / "one_cache.db").exists() and (tmp_path / "two_cache.db").exists()
+    assert (tmp_path / "one_sessions.db").exists() and (tmp_path / "two_sessions.db").exists()
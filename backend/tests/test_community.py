@@ -0,0 +1,40 @@
+import pytest
+
+from models import db, CommunityPost, CommunityComment
+from services.search_service import SearchService
+
+
+def make_thread(comment_count=5):
+    post = CommunityPost(title="Thread", content="Body")
+    db.session.add(post)
+    db.session.add_all([CommunityComment(post=post, content=f"Comment {i}") for i in range(comment_count)])
+    db.session.commit()
+    return post
+
+
+@pytest.mark.parametrize("limit", [0, -3])
+def test_comment_limit_is_at_least_one(client, limit):
+    post = make_thread()
+
+    page = client.get(f"/community/posts/{post.id}/comments?limit={limit}")
+    single = client.get(f"/community/posts/{post.id}?limit={limit}")
+
+    assert page.status_code == 200
+    assert len(page.get_json()["comments"]) == 1
+    assert page.get_json()["next_cursor"]
+    assert single.status_code == 200
+    assert len(single.get_json()["comments"]) == 1
+
+
+@pytest.mark.parametrize("limit", [0, -3])
+def test_search_limit_is_at_least_one(client, limit):
+    SearchService.install()
+    for i in range(5):
+        SearchService.index("community", "post", i + 1, f"Docker question {i}", "Running docker containers")
+    db.session.commit()
+
+    response = client.get(f"/community/search?q=docker&limit={limit}")
+
+    assert response.status_code == 200
+    assert len(response.get_json()["results"]) == 1
+    assert response.get_json()["next_cursor"]
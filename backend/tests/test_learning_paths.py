@@ -0,0 +1,56 @@
+import pytest
+
+from models import db, LearningPath, Module, PathRecommendation
+from services.core_services import TrendingService
+from services.search_service import SearchService
+
+
+@pytest.mark.parametrize("page, per_page", [(1, 0), (0, -1), (-2, 1)])
+def test_search_paging_is_clamped(client, page, per_page):
+    SearchService.install()
+    for i in range(3):
+        SearchService.index("learning", "path", i + 1, f"Python path {i}", "Learn python", group_id=i + 1)
+    db.session.commit()
+
+    response = client.get(f"/learning-paths/search?q=python&page={page}&per_page={per_page}")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body["page"], body["per_page"]) == (1, 1)
+    assert len(body["results"]) == 1
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_recommendation_limit_is_at_least_one(client, auth_headers, limit):
+    _, headers = auth_headers()
+    paths = [LearningPath(title=f"Path {i}", is_published=True) for i in range(4)]
+    db.session.add_all(paths)
+    db.session.flush()
+    db.session.add_all([
+        PathRecommendation(path_id=paths[0].id, recommended_path_id=path.id, rank=rank, score=1.0 / rank, co_followers=1)
+        for rank, path in enumerate(paths[1:], start=1)
+    ])
+    db.session.commit()
+
+    response = client.get(f"/learning-paths/recommendations?path_id={paths[0].id}&limit={limit}", headers=headers)
+
+    assert response.status_code == 200
+    assert [rec["id"] for rec in response.get_json()] == [paths[1].id]
+
+
+def test_module_completion_refreshes_trending_pages(client, auth_headers):
+    user, headers = auth_headers()
+    quiet = LearningPath(title="Quiet path", is_published=True, trending_score=0)
+    busy = LearningPath(title="Busy path", is_published=True,
+                        trending_score=TrendingService.event_score("complete_module") - 1)
+    module = Module(title="Module", learning_path=quiet)
+    user.followed_paths.append(quiet)
+    db.session.add_all([quiet, busy, module])
+    db.session.commit()
+
+    def trending_ids():
+        return [p["id"] for p in client.get("/learning-paths/paths?sort=trending").get_json()["paths"]]
+
+    assert trending_ids() == [busy.id, quiet.id]
+    assert client.post(f"/learning-paths/modules/{module.id}/complete", headers=headers).status_code == 200
+    assert trending_ids() == [quiet.id, busy.id]
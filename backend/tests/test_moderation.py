@@ -0,0 +1,30 @@
+from models import db, CommunityPost, ContentStatusEnum, ReviewItem
+
+
+def test_reports_on_hidden_posts_do_not_reopen_review(client, auth_headers):
+    _, headers = auth_headers()
+    post = CommunityPost(title="Spam", content="Buy now", is_hidden=True)
+    db.session.add(post)
+    db.session.flush()
+    item = ReviewItem(content_type="post", content_id=post.id, report_count=1, reporter_count=1,
+                      priority=0, status=ContentStatusEnum.approved)
+    db.session.add(item)
+    db.session.commit()
+
+    response = client.post("/moderation/flag", headers=headers, json={"post_id": post.id, "reason": "spam"})
+
+    assert response.status_code == 404
+    db.session.expire_all()
+    assert db.session.get(ReviewItem, item.id).status == ContentStatusEnum.approved
+
+
+def test_reports_on_visible_posts_open_review(client, auth_headers):
+    _, headers = auth_headers()
+    post = CommunityPost(title="Spam", content="Buy now")
+    db.session.add(post)
+    db.session.commit()
+
+    response = client.post("/moderation/flag", headers=headers, json={"post_id": post.id, "reason": "spam"})
+
+    assert response.status_code == 201
+    assert db.session.get(ReviewItem, response.get_json()["review_item_id"]).status == ContentStatusEnum.pending
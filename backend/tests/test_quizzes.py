@@ -0,0 +1,99 @@
+from models import db, Module, Quiz, Question, Choice, UserQuizAttempt, PointsLog
+
+
+def make_quiz(question_count=4, draw_count=None):
+    module = Module(title="Module")
+    quiz = Quiz(title="Quiz", module=module, passing_score=70, draw_count=draw_count)
+    db.session.add(quiz)
+    correct = []
+    for i in range(question_count):
+        question = Question(quiz=quiz, text=f"Question {i}")
+        right = Choice(question=question, text="right", is_correct=True)
+        db.session.add_all([question, right, Choice(question=question, text="wrong", is_correct=False)])
+        correct.append((question, right))
+    db.session.commit()
+    return module, quiz, correct
+
+
+def test_choice_only_counts_for_its_own_question(client, auth_headers):
+    _, headers = auth_headers()
+    module, quiz, correct = make_quiz()
+    known_right = correct[0][1].id
+
+    response = client.post(f"/modules/{module.id}/quizzes/{quiz.id}/attempt", headers=headers, json={
+        "answers": [{"question_id": question.id, "choice_id": known_right} for question, _ in correct]
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()["score"] == 25
+
+
+def test_correct_answers_score_full_marks(client, auth_headers):
+    _, headers = auth_headers()
+    module, quiz, correct = make_quiz()
+
+    response = client.post(f"/modules/{module.id}/quizzes/{quiz.id}/attempt", headers=headers, json={
+        "answers": [{"question_id": question.id, "choice_id": right.id} for question, right in correct]
+    })
+
+    assert response.get_json()["score"] == 100
+
+
+def test_viewing_a_quiz_writes_nothing(client, auth_headers):
+    _, headers = auth_headers()
+    module, sampled, _ = make_quiz(draw_count=2)
+    _, full, _ = make_quiz()
+    full.module_id = module.id
+    full.question_ids = None
+    db.session.commit()
+
+    for quiz in (sampled, full):
+        for _ in range(3):
+            assert client.get(f"/modules/{module.id}/quizzes/{quiz.id}", headers=headers).status_code == 200
+
+    db.session.expire_all()
+    assert UserQuizAttempt.query.count() == 0
+    assert db.session.get(Quiz, full.id).question_ids is None
+
+
+def test_started_attempt_is_graded_against_the_whole_quiz(client, auth_headers):
+    _, headers = auth_headers()
+    module, quiz, correct = make_quiz()
+    attempt_id = client.post(f"/modules/{module.id}/quizzes/{quiz.id}/start", headers=headers).get_json()["attempt_id"]
+
+    response = client.post(f"/modules/{module.id}/quizzes/{quiz.id}/attempt", headers=headers, json={
+        "attempt_id": attempt_id,
+        "answers": [{"question_id": correct[0][0].id, "choice_id": correct[0][1].id}]
+    })
+
+    assert response.get_json()["total_questions"] == 4
+    assert response.get_json()["score"] == 25
+    assert PointsLog.query.filter(PointsLog.reason.like("quiz_perfect%")).count() == 0
+
+
+def test_quiz_without_questions_is_not_graded(client, auth_headers):
+    _, headers = auth_headers()
+    module, quiz, _ = make_quiz(question_count=0)
+
+    assert client.post(f"/modules/{module.id}/quizzes/{quiz.id}/start", headers=headers).status_code == 400
+    response = client.post(f"/modules/{module.id}/quizzes/{quiz.id}/attempt", headers=headers, json={
+        "answers": [{"question_id": 1, "choice_id": 1}]
+    })
+
+    assert response.status_code == 400
+    assert UserQuizAttempt.query.count() == 0
+    assert PointsLog.query.count() == 0
+
+
+def test_timed_quiz_hides_questions_until_started(client, auth_headers):
+    _, headers = auth_headers()
+    module, quiz, _ = make_quiz()
+    quiz.time_limit_seconds = 60
+    db.session.commit()
+
+    body = client.get(f"/modules/{module.id}/quizzes/{quiz.id}", headers=headers).get_json()
+    assert body["requires_start"] is True
+    assert body["questions"] == []
+
+    started = client.post(f"/modules/{module.id}/quizzes/{quiz.id}/start", headers=headers).get_json()
+    assert len(started["questions"]) == 4
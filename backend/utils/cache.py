@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+
+class LRUCache:
+    """Small thread-safe in-process LRU cache.
+
+    Keys should embed a version read from the database (e.g. Quiz.cache_version)
+    so that every worker drops stale entries without explicit invalidation.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SharedCache:
+    """Byte-string cache shared by every worker through a local SQLite file.
+
+    Entries live in namespaces with a generation counter. Invalidating a
+    namespace bumps its generation, which orphans every entry written under
+    the old one in all workers at once. Callers read the generation with
+    `get` before querying the database and hand it back to `set`, so a value
+    computed before an invalidation is never served after it. Expired
+    entries are purged by `set`, at most once every `purge_interval` seconds
+    per worker.
+    """
+
+    purge_interval = 300
+
+    def __init__(self, path=None):
+        self.path = path
+        self._local = threading.local()
+        self._next_purge = 0
+
+    def _connect(self):
+        # Resolved per call so each app uses its own file; connections are per thread and file
+        path = self.path or current_app.config.get("SHARED_CACHE_DB") or os.path.join(
+            current_app.instance_path, "shared_cache.db"
+        )
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(path)
+        if conn is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_generation ("
+                " namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, generation INTEGER NOT NULL,"
+                " expires REAL NOT NULL, value BLOB NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entry_expires ON cache_entry (expires)")
+            conns[path] = conn
+        return conn
+
+    def get(self, namespace, key):
+        """Return (value or None, current generation) in one read."""
+        row = self._connect().execute(
+            "SELECT g.generation, e.value FROM (SELECT ? AS namespace) n"
+            " LEFT JOIN cache_generation g ON g.namespace = n.namespace"
+            " LEFT JOIN cache_entry e ON e.namespace = n.namespace AND e.key = ?"
+            "  AND e.generation = coalesce(g.generation, 0) AND e.expires > ?",
+            (namespace, key, time.time())
+        ).fetchone()
+        return row[1], row[0] or 0
+
+    def set(self, namespace, key, value, generation, ttl):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entry (namespace, key, generation, expires, value)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, generation, now + ttl, value)
+        )
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval
+            conn.execute("DELETE FROM cache_entry WHERE expires <= ?", (now,))
+
+    def invalidate(self, namespace):
+        """Drop every entry in `namespace`; call after the write has committed."""
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO cache_generation (namespace, generation) VALUES (?, 1)"
+            " ON CONFLICT (namespace) DO UPDATE SET generation = generation + 1",
+            (namespace,)
+        )
+        conn.execute("DELETE FROM cache_entry WHERE namespace = ?", (namespace,))
+
+
+shared_cache = SharedCache()
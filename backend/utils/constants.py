@@ -89,4 +89,62 @@ BADGE_RULES = {
         "name": "Challenge Conqueror",
         "description": "Awarded for completing 3 challenges successfully."
     }
-}
\ No newline at end of file
+}
+
+QUIZ_SESSION_CONFIG = {
+    'default_ttl_seconds': 3600,   # lifetime of sessions for untimed quizzes
+    'grace_seconds': 5,            # allowance for network latency on submit
+    'sweep_interval_seconds': 60,  # how often a worker bulk-evicts expired sessions
+}
+
+# Shared response cache (utils.cache.shared_cache)
+RESPONSE_CACHE_CONFIG = {
+    'catalogue_ttl_seconds': 300,  # upper bound on staleness if an invalidation is missed
+    'feed_ttl_seconds': 120,
+    'feed_cached_pages': 3,  # community feed pages 1..N are served from the shared cache
+}
+
+# List endpoints return a prefix of post/comment bodies cut in SQL
+CONTENT_PREVIEW_CONFIG = {
+    'feed_chars': 280,
+    'moderation_chars': 100,
+}
+
+# Buffered view counting (services.view_counter)
+VIEW_COUNTER_CONFIG = {
+    'flush_interval_seconds': 30,  # max age of buffered views before a write
+    'flush_threshold': 500,        # distinct paths/modules buffered before a write
+}
+
+# "Learners also followed" recommendations (services.recommendation_service)
+RECOMMENDATION_CONFIG = {
+    'neighbours_per_path': 20,  # top-K co-followed paths stored per path
+    'min_co_followers': 2,      # ignore pairs shared by fewer learners than this
+}
+
+# Trending learning paths (services.core_services.TrendingService)
+TRENDING_CONFIG = {
+    'half_life_hours': 72,           # an event counts half as much after this long
+    'epoch_timestamp': 1704067200,   # 2024-01-01 UTC; scores are stored relative to it
+    'weights': {
+        'follow': 1.0,
+        'complete_module': 0.5,
+    },
+}
+
+# Community "hot" feed (CommunityService.decay_hot_scores)
+HOT_FEED_CONFIG = {
+    'half_life_hours': 12,          # a comment counts half as much after this long
+    'floor': 0.01,                  # decayed scores below this drop to 0 and leave the active set
+    'rebuild_window_hours': 240,    # comments older than this are ignored when rebuilding
+}
+
+# Moderation review queue priority (services.moderation_service)
+REVIEW_QUEUE_CONFIG = {
+    'half_life_hours': 24,          # a report counts half as much after this long
+    'epoch_timestamp': 1704067200,  # 2024-01-01 UTC; priorities are stored relative to it
+    'weights': {
+        'reporter': 1.0,            # first report from a user
+        'repeat_report': 0.25,      # the same user reporting again after a review
+    },
+}